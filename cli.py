@@ -13,8 +13,8 @@ from typing import List, Optional
 from processors.github import process_github_repo, process_github_repos_batch
 from processors.gitlab import process_gitlab_project, process_gitlab_projects_batch
 from processors.local import process_local_blame, process_local_repo
-from storage import create_store, detect_db_type
-from utils import _parse_since, BATCH_SIZE, MAX_WORKERS
+from storage import close_all_engines, create_store, detect_db_type
+from utils import _parse_since, BATCH_SIZE, DB_ECHO, MAX_WORKERS, run_async
 
 REPO_ROOT = Path(__file__).resolve().parent
 
@@ -85,9 +85,12 @@ def _resolve_db_type(db_url: str, db_type: Optional[str]) -> str:
 
 
 async def _run_with_store(db_url: str, db_type: str, handler) -> None:
-    store = create_store(db_url, db_type)
-    async with store:
-        await handler(store)
+    store = create_store(db_url, db_type, echo=DB_ECHO)
+    try:
+        async with store:
+            await handler(store)
+    finally:
+        await close_all_engines()
 
 
 def _cmd_sync_teams(ns: argparse.Namespace) -> int:
@@ -191,7 +194,7 @@ def _cmd_sync_teams(ns: argparse.Namespace) -> int:
         await store.insert_teams(teams_data)
         logging.info(f"Synced {len(teams_data)} teams to DB.")
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -280,7 +283,7 @@ def _sync_local_target(ns: argparse.Namespace, target: str) -> int:
             sync_blame=False,
         )
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -340,7 +343,7 @@ def _sync_github_target(ns: argparse.Namespace, target: str) -> int:
             since=since,
         )
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -398,7 +401,7 @@ def _sync_gitlab_target(ns: argparse.Namespace, target: str) -> int:
             since=since,
         )
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -460,7 +463,7 @@ def _sync_synthetic_target(ns: argparse.Namespace, target: str) -> int:
                 await store.insert_incidents(incidents)
             return
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -532,12 +535,15 @@ def _cmd_metrics_complexity(ns: argparse.Namespace) -> int:
     # Batch mode: Fetch repos from DB and try to find them locally
     async def fetch_repos():
         db_type = _resolve_db_type(ns.db, None)
-        store = create_store(ns.db, db_type)
-        async with store:
-            return await store.get_all_repos()
+        store = create_store(ns.db, db_type, echo=DB_ECHO)
+        try:
+            async with store:
+                return await store.get_all_repos()
+        finally:
+            await close_all_engines()
 
     try:
-        repos = asyncio.run(fetch_repos())
+        repos = run_async(fetch_repos())
     except Exception as e:
         logging.error(f"Failed to fetch repos from DB: {e}")
         return 1
@@ -1714,7 +1720,7 @@ def _cmd_fixtures_generate(ns: argparse.Namespace) -> int:
 
                     logging.info("Generated fixtures metrics for %s", r_name)
 
-    asyncio.run(_run_with_store(ns.db, db_type, _handler))
+    run_async(_run_with_store(ns.db, db_type, _handler))
     return 0
 
 
@@ -9,7 +9,7 @@ from .base import BatchResult, GitConnector
 from .exceptions import (APIException, AuthenticationException,
                          ConnectorException, NotFoundException,
                          PaginationException, RateLimitException)
-from .github import GitHubConnector, match_repo_pattern
+from .github import GitHubConnector, compile_pattern, match_repo_pattern
 from .gitlab import GitLabBatchResult, GitLabConnector, match_project_pattern
 from .models import (Author, BlameRange, CommitStats, FileBlame, Organization,
                      PullRequest, Repository, RepoStats)
@@ -23,6 +23,7 @@ __all__ = [
     # GitHub Batch processing
     "BatchResult",
     "match_repo_pattern",
+    "compile_pattern",
     # GitLab Batch processing
     "GitLabBatchResult",
     "match_project_pattern",
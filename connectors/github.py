@@ -7,7 +7,9 @@ contributors, statistics, pull requests, and blame information from GitHub.
 
 import asyncio
 import fnmatch
+import functools
 import logging
+import re
 import time
 import inspect
 from queue import Queue
@@ -55,7 +57,25 @@ def match_repo_pattern(full_name: str, pattern: str) -> bool:
         - '*/sync*' matches 'anyorg/sync-tool'
         - 'org/repo' matches exactly 'org/repo'
     """
-    return fnmatch.fnmatch(full_name.lower(), pattern.lower())
+    return _compile_pattern(pattern).match(full_name.lower()) is not None
+
+
+def compile_pattern(pattern: str) -> Callable[[str], bool]:
+    """
+    Build a reusable matcher for a repository pattern.
+
+    :param pattern: Pattern to match (e.g., 'chrisgeo/m*').
+    :return: Callable taking a repository full name, equivalent to
+             ``match_repo_pattern(full_name, pattern)``.
+    """
+    regex = _compile_pattern(pattern)
+    return lambda full_name: regex.match(full_name.lower()) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Translate a repo pattern once; callers reuse it across every repo name."""
+    return re.compile(fnmatch.translate(pattern.lower()))
 
 
 class GitHubConnector(GitConnector):
@@ -192,6 +212,7 @@ class GitHubConnector(GitConnector):
         """
         try:
             repos = []
+            matcher = compile_pattern(pattern) if pattern else None
 
             # Determine the appropriate API method and parameters
             if search:
@@ -213,11 +234,8 @@ class GitHubConnector(GitConnector):
                 gh_repos = source.get_repos()
 
             for gh_repo in gh_repos:
-                if max_repos and len(repos) >= max_repos:
-                    break
-
                 # Apply pattern filter early to avoid unnecessary object creation
-                if pattern and not match_repo_pattern(gh_repo.full_name, pattern):
+                if matcher and not matcher(gh_repo.full_name):
                     continue
 
                 repo = Repository(
@@ -236,6 +254,9 @@ class GitHubConnector(GitConnector):
 
                 repos.append(repo)
                 logger.debug(f"Retrieved repository: {repo.full_name}")
+                # Stop before pulling the next item so no extra page is fetched.
+                if max_repos and len(repos) >= max_repos:
+                    break
 
             pattern_msg = f" matching pattern '{pattern}'" if pattern else ""
             logger.info(f"Retrieved {len(repos)} repositories{pattern_msg}")
@@ -715,7 +736,8 @@ class GitHubConnector(GitConnector):
         :param pattern: Optional fnmatch-style pattern to filter repos (e.g., 'chrisgeo/m*').
         :param batch_size: Number of repos to process in each batch.
         :param max_concurrent: Maximum number of concurrent workers for processing.
-        :param rate_limit_delay: Delay in seconds between batches for rate limiting.
+        :param rate_limit_delay: Minimum delay in seconds between the starts of
+                                 consecutive batches, for rate limiting.
         :param max_commits_per_repo: Maximum commits to analyze per repository.
         :param max_repos: Maximum number of repositories to process.
         :param on_repo_complete: Optional callback function called after each repo is processed.
@@ -749,99 +771,96 @@ class GitHubConnector(GitConnector):
 
         results: List[BatchResult] = []
 
-        # Step 2: Process in batches (queue-based workers + shared backoff)
-        for batch_start in range(0, len(repos), batch_size):
-            batch_end = min(batch_start + batch_size, len(repos))
-            batch = repos[batch_start:batch_end]
+        # Step 2: One thread pool over every repo so a slow repo does not hold
+        # back the next batch; rate_limit_delay paces when each batch may start.
+        batch_size = max(1, batch_size)
+        work_q: Queue = Queue()
+        for index, repo in enumerate(repos):
+            work_q.put((index, repo))
 
-            logger.info(
-                "Processing batch %s: repos %s-%s of %s",
-                batch_start // batch_size + 1,
-                batch_start + 1,
-                batch_end,
-                len(repos),
-            )
-
-            work_q: Queue[Repository] = Queue()
-            for repo in batch:
-                work_q.put(repo)
-
-            gate = RateLimitGate(
-                RateLimitConfig(
-                    initial_backoff_seconds=max(1.0, rate_limit_delay),
-                )
+        gate = RateLimitGate(
+            RateLimitConfig(
+                initial_backoff_seconds=max(1.0, rate_limit_delay),
             )
-            results_lock = threading.Lock()
-
-            def worker(
-                work_q: Queue,
-                gate: RateLimitGate,
-                results_lock: threading.Lock,
-            ) -> None:
-                while True:
-                    try:
-                        repo = work_q.get_nowait()
-                    except QueueEmpty:
-                        return
-
-                    try:
-                        attempts = 0
-                        while True:
-                            gate.wait_sync()
-                            try:
-                                result = self._process_single_repo_stats(
-                                    repo,
-                                    max_commits=max_commits_per_repo,
+        )
+        results_lock = threading.Lock()
+        started_at = time.monotonic()
+
+        def worker() -> None:
+            while True:
+                try:
+                    index, repo = work_q.get_nowait()
+                except QueueEmpty:
+                    return
+
+                try:
+                    batch_index = index // batch_size
+                    if index % batch_size == 0:
+                        logger.info(
+                            "Processing batch %s: repos %s-%s of %s",
+                            batch_index + 1,
+                            index + 1,
+                            min(index + batch_size, len(repos)),
+                            len(repos),
+                        )
+                    if rate_limit_delay > 0:
+                        wait = (
+                            started_at
+                            + batch_index * rate_limit_delay
+                            - time.monotonic()
+                        )
+                        if wait > 0:
+                            logger.debug("Rate limiting: waiting %.1fs", wait)
+                            time.sleep(wait)
+
+                    attempts = 0
+                    while True:
+                        gate.wait_sync()
+                        try:
+                            result = self._process_single_repo_stats(
+                                repo,
+                                max_commits=max_commits_per_repo,
+                            )
+                            gate.reset()
+                            with results_lock:
+                                results.append(result)
+                            if on_repo_complete:
+                                on_repo_complete(result)
+                            break
+                        except RateLimitException as e:
+                            attempts += 1
+                            reset_delay = (
+                                getattr(e, "retry_after_seconds", None)
+                                or self._rate_limit_reset_delay_seconds()
+                            )
+                            applied = gate.penalize(reset_delay)
+                            logger.info(
+                                "GitHub rate limited; backoff %.1fs (%s)",
+                                applied,
+                                e,
+                            )
+                            if attempts >= 10:
+                                result = BatchResult(
+                                    repository=repo,
+                                    error=str(e),
+                                    success=False,
                                 )
-                                gate.reset()
                                 with results_lock:
                                     results.append(result)
                                 if on_repo_complete:
                                     on_repo_complete(result)
                                 break
-                            except RateLimitException as e:
-                                attempts += 1
-                                reset_delay = (
-                                    getattr(e, "retry_after_seconds", None)
-                                    or self._rate_limit_reset_delay_seconds()
-                                )
-                                applied = gate.penalize(reset_delay)
-                                logger.info(
-                                    "GitHub rate limited; backoff %.1fs (%s)",
-                                    applied,
-                                    e,
-                                )
-                                if attempts >= 10:
-                                    result = BatchResult(
-                                        repository=repo,
-                                        error=str(e),
-                                        success=False,
-                                    )
-                                    with results_lock:
-                                        results.append(result)
-                                    if on_repo_complete:
-                                        on_repo_complete(result)
-                                    break
-                    finally:
-                        work_q.task_done()
-
-            threads = [
-                threading.Thread(
-                    target=worker,
-                    args=(work_q, gate, results_lock),
-                    daemon=True,
-                )
-                for _ in range(max(1, min(max_concurrent, len(batch))))
-            ]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join()
-
-            # Rate limiting delay between batches
-            if batch_end < len(repos) and rate_limit_delay > 0:
-                logger.debug("Rate limiting: waiting %ss", rate_limit_delay)
-                time.sleep(rate_limit_delay)
+                finally:
+                    work_q.task_done()
+
+        threads = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(max(1, min(max_concurrent, len(repos))))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
 
         logger.info(
             "Completed processing %s repositories, %s successful",
@@ -874,7 +893,8 @@ class GitHubConnector(GitConnector):
         :param pattern: Optional fnmatch-style pattern to filter repos (e.g., 'chrisgeo/m*').
         :param batch_size: Number of repos to process in each batch.
         :param max_concurrent: Maximum number of concurrent workers for processing.
-        :param rate_limit_delay: Delay in seconds between batches for rate limiting.
+        :param rate_limit_delay: Minimum delay in seconds between the starts of
+                                 consecutive batches, for rate limiting.
         :param max_commits_per_repo: Maximum commits to analyze per repository.
         :param max_repos: Maximum number of repositories to process.
         :param on_repo_complete: Optional callback function called after each repo is processed.
@@ -911,96 +931,95 @@ class GitHubConnector(GitConnector):
 
         results: List[BatchResult] = []
 
-        # Step 2: Process in batches with rate limiting
-        for batch_start in range(0, len(repos), batch_size):
-            batch_end = min(batch_start + batch_size, len(repos))
-            batch = repos[batch_start:batch_end]
+        # Step 2: One worker pool over every repo so a slow repo does not hold
+        # back the next batch; rate_limit_delay paces when each batch may start.
+        batch_size = max(1, batch_size)
+        work_q: asyncio.Queue = asyncio.Queue()
+        for index, repo in enumerate(repos):
+            work_q.put_nowait((index, repo))
 
-            logger.info(
-                "Processing async batch %s: repos %s-%s of %s",
-                batch_start // batch_size + 1,
-                batch_start + 1,
-                batch_end,
-                len(repos),
-            )
-
-            work_q: asyncio.Queue[Repository] = asyncio.Queue()
-            for repo in batch:
-                await work_q.put(repo)
-
-            gate = RateLimitGate(
-                RateLimitConfig(
-                    initial_backoff_seconds=max(1.0, rate_limit_delay),
-                )
+        gate = RateLimitGate(
+            RateLimitConfig(
+                initial_backoff_seconds=max(1.0, rate_limit_delay),
             )
-
-            async def worker_async(
-                work_q: asyncio.Queue = work_q,
-                gate: RateLimitGate = gate,
-            ) -> None:
-                while True:
-                    try:
-                        repo = work_q.get_nowait()
-                    except asyncio.QueueEmpty:
-                        return
-
-                    try:
-                        attempts = 0
-                        while True:
-                            await gate.wait_async()
-                            try:
-                                result = await loop.run_in_executor(
+        )
+        started_at = loop.time()
+
+        async def worker_async() -> None:
+            while True:
+                try:
+                    index, repo = work_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    batch_index = index // batch_size
+                    if index % batch_size == 0:
+                        logger.info(
+                            "Processing async batch %s: repos %s-%s of %s",
+                            batch_index + 1,
+                            index + 1,
+                            min(index + batch_size, len(repos)),
+                            len(repos),
+                        )
+                    if rate_limit_delay > 0:
+                        wait = started_at + batch_index * rate_limit_delay - loop.time()
+                        if wait > 0:
+                            logger.debug(
+                                "Rate limiting: waiting %.1fs before batch %s",
+                                wait,
+                                batch_index + 1,
+                            )
+                            await asyncio.sleep(wait)
+
+                    attempts = 0
+                    while True:
+                        await gate.wait_async()
+                        try:
+                            result = await loop.run_in_executor(
+                                None,
+                                lambda: self._process_single_repo_stats(
+                                    repo,
+                                    max_commits=max_commits_per_repo,
+                                ),
+                            )
+                            gate.reset()
+                            results.append(result)
+                            if on_repo_complete:
+                                on_repo_complete(result)
+                            break
+                        except RateLimitException as e:
+                            attempts += 1
+                            retry_after = getattr(e, "retry_after_seconds", None)
+                            if retry_after is None:
+                                retry_after = await loop.run_in_executor(
                                     None,
-                                    lambda: self._process_single_repo_stats(
-                                        repo,
-                                        max_commits=max_commits_per_repo,
-                                    ),
+                                    self._rate_limit_reset_delay_seconds,
+                                )
+                            applied = gate.penalize(retry_after)
+                            logger.info(
+                                "GitHub rate limited; backoff %.1fs (%s)",
+                                applied,
+                                e,
+                            )
+                            if attempts >= 10:
+                                result = BatchResult(
+                                    repository=repo,
+                                    error=str(e),
+                                    success=False,
                                 )
-                                gate.reset()
                                 results.append(result)
                                 if on_repo_complete:
                                     on_repo_complete(result)
                                 break
-                            except RateLimitException as e:
-                                attempts += 1
-                                retry_after = getattr(e, "retry_after_seconds", None)
-                                if retry_after is None:
-                                    retry_after = await loop.run_in_executor(
-                                        None,
-                                        self._rate_limit_reset_delay_seconds,
-                                    )
-                                applied = gate.penalize(retry_after)
-                                logger.info(
-                                    "GitHub rate limited; backoff %.1fs (%s)",
-                                    applied,
-                                    e,
-                                )
-                                if attempts >= 10:
-                                    result = BatchResult(
-                                        repository=repo,
-                                        error=str(e),
-                                        success=False,
-                                    )
-                                    results.append(result)
-                                    if on_repo_complete:
-                                        on_repo_complete(result)
-                                    break
-                    finally:
-                        work_q.task_done()
-
-            workers = [
-                asyncio.create_task(worker_async())
-                for _ in range(max(1, min(max_concurrent, len(batch))))
-            ]
-            await asyncio.gather(*workers)
-
-            # Rate limiting delay between batches
-            if batch_end < len(repos) and rate_limit_delay > 0:
-                logger.debug(
-                    "Rate limiting: waiting %ss before next batch",
-                    rate_limit_delay,
-                )
-                await asyncio.sleep(rate_limit_delay)
+                finally:
+                    work_q.task_done()
+
+        workers = [
+            asyncio.create_task(worker_async())
+            for _ in range(max(1, min(max_concurrent, len(repos))))
+        ]
+        await asyncio.gather(*workers)
 
         logger.info(
             "Completed async processing %s repositories, %s successful",
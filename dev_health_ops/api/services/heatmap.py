@@ -28,6 +28,7 @@ from .people_identity import (
 
 
 WEEKDAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HOUR_LABELS = [f"{hour:02d}" for hour in range(24)]
 STATUS_ORDER = [
     "backlog",
     "todo",
@@ -109,7 +110,7 @@ def _metric_for(type_value: str, metric_value: str) -> Optional[HeatmapMetric]:
 
 
 def _hour_labels() -> List[str]:
-    return [f"{hour:02d}" for hour in range(24)]
+    return HOUR_LABELS[:]
 
 
 def _weekday_labels() -> List[str]:
@@ -15,7 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from connectors import GitHubConnector, GitLabConnector
 from models.git import GitCommit, GitCommitStat, Repo
-from storage import SQLAlchemyStore
+from storage import SQLAlchemyStore, close_all_engines
 
 
 async def github_to_storage_example():
@@ -251,6 +251,9 @@ async def main():
     # Run GitLab example
     await gitlab_to_storage_example()
 
+    # Both examples share one pooled engine; release it before the loop closes.
+    await close_all_engines()
+
     print("\n" + "=" * 60)
     print("Integration examples completed!")
     print(
@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 import uuid
 from datetime import date, datetime
-from typing import Any, Dict, List, Sequence, Optional
+from typing import Dict, List, Sequence, Optional
 
 from metrics.schemas import (
     CommitStatRow, 
@@ -27,7 +27,10 @@ def compute_file_hotspots(
     hotspot_raw = α*log(1 + churn_f) + β*contributors_f + γ*commit_count_f
     Weights: α=0.4, β=0.3, γ=0.3
     """
-    file_map: Dict[str, Dict[str, Any]] = {}
+    # Flat per-path accumulators: one dict probe each instead of nested dicts.
+    churn_by_path: Dict[str, int] = {}
+    authors_by_path: Dict[str, set] = {}
+    commits_by_path: Dict[str, set] = {}
 
     for row in window_stats:
         if row["repo_id"] != repo_id:
@@ -37,31 +40,28 @@ def compute_file_hotspots(
         if not path:
             continue
 
-        if path not in file_map:
-            file_map[path] = {
-                "churn": 0,
-                "authors": set(),
-                "commits": set(),
-            }
-
-        stats = file_map[path]
         additions = max(0, int(row.get("additions") or 0))
         deletions = max(0, int(row.get("deletions") or 0))
-        stats["churn"] += additions + deletions
-
         author = (
             row.get("author_email") or row.get("author_name") or "unknown"
         ).strip()
-        stats["authors"].add(author)
-        stats["commits"].add(row["commit_hash"])
+
+        authors = authors_by_path.get(path)
+        if authors is None:
+            churn_by_path[path] = additions + deletions
+            authors_by_path[path] = {author}
+            commits_by_path[path] = {row["commit_hash"]}
+        else:
+            churn_by_path[path] += additions + deletions
+            authors.add(author)
+            commits_by_path[path].add(row["commit_hash"])
 
     records: List[FileMetricsRecord] = []
     alpha, beta, gamma = 0.4, 0.3, 0.3
 
-    for path, stats in file_map.items():
-        churn = stats["churn"]
-        contributors = len(stats["authors"])
-        commits_count = len(stats["commits"])
+    for path, churn in churn_by_path.items():
+        contributors = len(authors_by_path[path])
+        commits_count = len(commits_by_path[path])
 
         # Formula from docs 1.3.2
         hotspot_score = (
@@ -60,7 +60,7 @@ from metrics.sinks.sqlite import SQLiteMetricsSink
 from providers.identity import load_identity_resolver
 from providers.status_mapping import load_status_mapping
 from providers.teams import load_team_resolver
-from storage import create_store, detect_db_type
+from storage import close_all_engines, create_store, detect_db_type
 
 logger = logging.getLogger(__name__)
 
@@ -1165,12 +1165,15 @@ def _load_complexity_snapshots(
     async def _fetch():
         backend = detect_db_type(db_url)
         store = create_store(db_url, backend)
-        async with store:
-            return await store.get_complexity_snapshots(
-                as_of_day=as_of_day,
-                repo_id=repo_id,
-                repo_name=repo_name,
-            )
+        try:
+            async with store:
+                return await store.get_complexity_snapshots(
+                    as_of_day=as_of_day,
+                    repo_id=repo_id,
+                    repo_name=repo_name,
+                )
+        finally:
+            await close_all_engines()
 
     try:
         snapshots = asyncio.run(_fetch())
@@ -1228,8 +1231,11 @@ def _load_work_item_user_metrics_daily(
     async def _fetch():
         backend = detect_db_type(db_url)
         store = create_store(db_url, backend)
-        async with store:
-            return await store.get_work_item_user_metrics_daily(day=day)
+        try:
+            async with store:
+                return await store.get_work_item_user_metrics_daily(day=day)
+        finally:
+            await close_all_engines()
 
     try:
         return asyncio.run(_fetch())
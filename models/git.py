@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import logging
 import os
@@ -24,6 +25,11 @@ from typing import Optional, List, Tuple
 Base = declarative_base()
 
 
+def _utcnow() -> datetime:
+    """Column default for created/synced timestamps (timezone-aware UTC)."""
+    return datetime.now(timezone.utc)
+
+
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
 
@@ -85,6 +91,46 @@ def get_repo_uuid_from_repo(repo: str) -> uuid.UUID:
     return uuid.UUID(bytes=uuid_bytes)
 
 
+@functools.lru_cache(maxsize=16)
+def _repo_uuid_from_git(repo_path: str) -> uuid.UUID:
+    """
+    Derive the repository UUID from its remote URL or absolute path.
+
+    Cached per absolute path, so the git config is read once per process.
+    Errors are not cached and propagate to ``get_repo_uuid``.
+    """
+    # Try to get repository information from git
+    git_repo = GitRepo(repo_path)
+
+    # Try to get remote URL (most reliable identifier)
+    if git_repo.remotes:
+        remote_url = None
+        # Try to get the origin remote first
+        if "origin" in [r.name for r in git_repo.remotes]:
+            origin = git_repo.remote("origin")
+            remote_url = list(origin.urls)[0] if origin.urls else None
+        else:
+            # Use first available remote
+            remote_url = (
+                list(git_repo.remotes[0].urls)[0]
+                if git_repo.remotes[0].urls
+                else None
+            )
+
+        if remote_url:
+            # Create deterministic UUID from remote URL
+            # Use SHA256 hash and convert to UUID format
+            hash_obj = hashlib.sha256(remote_url.encode("utf-8"))
+            # Take first 16 bytes of hash and create UUID
+            uuid_bytes = hash_obj.digest()[:16]
+            return uuid.UUID(bytes=uuid_bytes)
+
+    # Fallback to absolute path if no remote
+    hash_obj = hashlib.sha256(repo_path.encode("utf-8"))
+    uuid_bytes = hash_obj.digest()[:16]
+    return uuid.UUID(bytes=uuid_bytes)
+
+
 def get_repo_uuid(repo_path: str) -> uuid.UUID:
     """
     Generate a deterministic UUID for a repository based on git data.
@@ -103,38 +149,7 @@ def get_repo_uuid(repo_path: str) -> uuid.UUID:
         return uuid.UUID(env_uuid)
 
     try:
-        # Try to get repository information from git
-        git_repo = GitRepo(repo_path)
-
-        # Try to get remote URL (most reliable identifier)
-        if git_repo.remotes:
-            remote_url = None
-            # Try to get the origin remote first
-            if "origin" in [r.name for r in git_repo.remotes]:
-                origin = git_repo.remote("origin")
-                remote_url = list(origin.urls)[0] if origin.urls else None
-            else:
-                # Use first available remote
-                remote_url = (
-                    list(git_repo.remotes[0].urls)[0]
-                    if git_repo.remotes[0].urls
-                    else None
-                )
-
-            if remote_url:
-                # Create deterministic UUID from remote URL
-                # Use SHA256 hash and convert to UUID format
-                hash_obj = hashlib.sha256(remote_url.encode("utf-8"))
-                # Take first 16 bytes of hash and create UUID
-                uuid_bytes = hash_obj.digest()[:16]
-                return uuid.UUID(bytes=uuid_bytes)
-
-        # Fallback to absolute path if no remote
-        abs_path = os.path.abspath(repo_path)
-        hash_obj = hashlib.sha256(abs_path.encode("utf-8"))
-        uuid_bytes = hash_obj.digest()[:16]
-        return uuid.UUID(bytes=uuid_bytes)
-
+        return _repo_uuid_from_git(os.path.abspath(repo_path))
     except Exception as e:
         # If anything fails, generate a random UUID
         logging.warning(
@@ -196,7 +211,7 @@ class Repo(Base, GitRepo):
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp of when the MergeStat repo entry was created",
     )
     settings = Column(
@@ -265,7 +280,7 @@ class GitRef(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -291,7 +306,7 @@ class GitFile(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -333,7 +348,7 @@ class GitCommit(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -375,7 +390,7 @@ class GitCommitStat(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -470,7 +485,7 @@ class GitBlame(Base, GitBlameMixin):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -549,7 +564,7 @@ class GitPullRequest(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
         comment="timestamp when record was synced into the MergeStat database",
     )
 
@@ -594,7 +609,7 @@ class GitPullRequestReview(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
     )
 
     # Relationships
@@ -629,7 +644,7 @@ class CiPipelineRun(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
     )
 
     repo = relationship("Repo", back_populates="ci_pipeline_runs")
@@ -653,7 +668,7 @@ class Deployment(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
     )
 
     repo = relationship("Repo", back_populates="deployments")
@@ -673,7 +688,7 @@ class Incident(Base):
     last_synced = Column(
         DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=_utcnow,
     )
 
     repo = relationship("Repo", back_populates="incidents")
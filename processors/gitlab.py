@@ -512,16 +512,13 @@ async def _backfill_gitlab_missing_data(
     max_commits: Optional[int],
     blame_only: bool = False,
 ) -> None:
-    if not (
-        hasattr(store, "has_any_git_files")
-        and hasattr(store, "has_any_git_blame")
-        and hasattr(store, "has_any_git_commit_stats")
-    ):
+    if not hasattr(store, "existence_snapshot"):
         return
 
-    needs_files = not await store.has_any_git_files(db_repo.id)
-    needs_commit_stats = False if blame_only else not await store.has_any_git_commit_stats(db_repo.id)
-    needs_blame = not await store.has_any_git_blame(db_repo.id)
+    existing = await store.existence_snapshot(db_repo.id)
+    needs_files = not existing["git_files"]
+    needs_commit_stats = False if blame_only else not existing["git_commit_stats"]
+    needs_blame = not existing["git_blame"]
 
     if not (needs_files or needs_commit_stats or needs_blame):
         return
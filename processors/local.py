@@ -1,9 +1,24 @@
 import asyncio
+import functools
+import inspect
 import logging
 import os
 import re
+import subprocess
+import tempfile
 import uuid
-from typing import List, Optional, Tuple, Set, Dict, Any
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -17,6 +32,54 @@ from utils import (
 )
 
 
+class _QueuedWriter:
+    """
+    Drain store writes on a single background task.
+
+    Producers hand over finished batches with ``put`` and keep extracting the
+    next one while the previous write is in flight. Writes still run one at a
+    time, so stores whose session cannot be shared concurrently stay safe, and
+    ``maxsize`` bounds how many batches wait in memory. Leaving the context
+    waits for queued writes and re-raises the first write error.
+    """
+
+    def __init__(self, maxsize: int = 4) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._error: Optional[BaseException] = None
+
+    async def __aenter__(self) -> "_QueuedWriter":
+        self._task = asyncio.create_task(self._drain())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._queue.put(None)
+        assert self._task is not None
+        await self._task
+        if self._error is not None and exc_type is None:
+            raise self._error
+
+    async def put(
+        self, write: Callable[[List[Any]], Awaitable[None]], batch: List[Any]
+    ) -> None:
+        if self._error is not None:
+            raise self._error
+        await self._queue.put((write, batch))
+
+    async def _drain(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            write, batch = item
+            # After a failure keep draining so producers never block on put.
+            if self._error is None:
+                try:
+                    await write(batch)
+                except Exception as exc:
+                    self._error = exc
+
+
 _GITHUB_MERGE_PR_RE = re.compile(
     r"^Merge pull request #(?P<number>\d+)\b",
     re.MULTILINE,
@@ -254,6 +317,199 @@ def _compute_commit_stats_sync(commit: Any, repo_id: uuid.UUID) -> List[GitCommi
     return stats
 
 
+def _iter_git_output(repo_root: str, *args: str) -> Generator[str, None, None]:
+    """Run ``git`` in ``repo_root`` and yield its NUL-separated output fields."""
+    # stderr goes to a file rather than a pipe: nothing reads it until stdout
+    # is exhausted, and a full stderr pipe would block git mid-stream.
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        ["git", "-C", repo_root, *args],
+        stdout=subprocess.PIPE,
+        stderr=stderr_file,
+    )
+    assert proc.stdout is not None
+    pending = b""
+    try:
+        while chunk := proc.stdout.read(1 << 16):
+            *fields, pending = (pending + chunk).split(b"\0")
+            for field in fields:
+                yield field.decode("utf-8", errors="replace")
+        if pending:
+            yield pending.decode("utf-8", errors="replace")
+        if proc.wait() != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+            raise RuntimeError(
+                f"git {args[0]} failed: {stderr.decode('utf-8', errors='replace').strip()}"
+            )
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        stderr_file.close()
+
+
+# One NUL-terminated record per commit (``-z``), fields split by 0x1f.
+_GIT_LOG_FORMAT = "%H%x1f%an%x1f%ae%x1f%cn%x1f%ce%x1f%cI%x1f%P%x1f%B"
+
+
+def _parse_git_log_record(record: str, repo_id: uuid.UUID) -> GitCommit:
+    (
+        sha,
+        author_name,
+        author_email,
+        committer_name,
+        committer_email,
+        committed_at,
+        parents,
+        message,
+    ) = record.split("\x1f", 7)
+    committed_dt = _normalize_datetime(datetime.fromisoformat(committed_at))
+    return GitCommit(
+        repo_id=repo_id,
+        hash=sha,
+        message=message,
+        author_name=author_name,
+        author_email=author_email,
+        author_when=committed_dt,
+        committer_name=committer_name,
+        committer_email=committer_email,
+        committer_when=committed_dt,
+        parents=len(parents.split()),
+    )
+
+
+def _iter_git_log_batches(
+    repo_root: str, repo_id: uuid.UUID, since: Optional[datetime] = None
+) -> Generator[List[GitCommit], None, None]:
+    """
+    Stream ``git log`` and yield GitCommit batches of up to BATCH_SIZE.
+
+    Like ``iter_commits_since``, stops at the first commit older than ``since``.
+    """
+    records = _iter_git_output(repo_root, "log", "-z", f"--format={_GIT_LOG_FORMAT}")
+    batch: List[GitCommit] = []
+    try:
+        for record in records:
+            git_commit = _parse_git_log_record(record, repo_id)
+            if since and git_commit.committer_when < since:
+                break
+            batch.append(git_commit)
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = []
+    finally:
+        records.close()
+    if batch:
+        yield batch
+
+
+def _git_mode(mode: str) -> str:
+    # Same rendering as str(Diff.a_mode) on the GitPython path.
+    value = int(mode, 8)
+    return str(value) if value else "000000"
+
+
+def _iter_git_log_stat_batches(
+    repo_root: str, repo_id: uuid.UUID, since: Optional[datetime] = None
+) -> Generator[List[GitCommitStat], None, None]:
+    """
+    Stream ``git log --raw --numstat`` and yield GitCommitStat batches.
+
+    Each commit is diffed against its first parent, as on the GitPython path,
+    and history is read in one process instead of two git calls per commit.
+    Root commits are diffed against the empty tree, so they report the files
+    they added rather than a diff against the working tree.
+    """
+    fields = _iter_git_output(
+        repo_root,
+        "log",
+        "-z",
+        "--raw",
+        "--numstat",
+        "--root",
+        "-M",
+        "--diff-merges=first-parent",
+        "--format=%x1e%H%x1f%cI",
+    )
+    batch: List[GitCommitStat] = []
+    sha = ""
+    # (path, old mode, new mode) from --raw, then line counts from --numstat.
+    changes: List[Tuple[str, str, str]] = []
+    line_counts: Dict[str, Tuple[int, int]] = {}
+
+    def flush_commit() -> None:
+        for path, old_mode, new_mode in changes:
+            additions, deletions = line_counts.get(path, (0, 0))
+            batch.append(
+                GitCommitStat(
+                    repo_id=repo_id,
+                    commit_hash=sha,
+                    file_path=path,
+                    additions=additions,
+                    deletions=deletions,
+                    old_file_mode=old_mode,
+                    new_file_mode=new_mode,
+                )
+            )
+        changes.clear()
+        line_counts.clear()
+
+    try:
+        for field in fields:
+            field = field.lstrip("\n")
+            if not field:
+                continue
+            if field.startswith("\x1e"):
+                flush_commit()
+                if len(batch) >= BATCH_SIZE:
+                    yield batch
+                    batch = []
+                sha, committed_at = field[1:].split("\x1f", 1)
+                committed_dt = _normalize_datetime(datetime.fromisoformat(committed_at))
+                if since and committed_dt < since:
+                    sha = ""
+                    break
+            elif field.startswith(":"):
+                old_mode, new_mode, _, _, status = field[1:].split(" ", 4)
+                path = next(fields)
+                if status[0] in "RC":
+                    path = next(fields)
+                changes.append((path, _git_mode(old_mode), _git_mode(new_mode)))
+            else:
+                added, deleted, path = field.split("\t", 2)
+                if not path:
+                    next(fields)
+                    path = next(fields)
+                line_counts[path] = (
+                    int(added) if added != "-" else 0,
+                    int(deleted) if deleted != "-" else 0,
+                )
+    finally:
+        fields.close()
+    if sha:
+        flush_commit()
+    if batch:
+        yield batch
+
+
+async def _queue_git_log_batches(
+    batches: Generator[List[Any], None, None],
+    write: Callable[[List[Any]], Awaitable[None]],
+    label: str,
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        async with _QueuedWriter() as writer:
+            # One executor hop per batch rather than per commit.
+            while batch := await loop.run_in_executor(None, next, batches, None):
+                await writer.put(write, batch)
+                logging.info(f"Queued {len(batch)} {label}")
+    finally:
+        batches.close()
+
+
 async def process_git_commits(
     repo: Repo,
     store: Any,  # DataStore
@@ -262,57 +518,58 @@ async def process_git_commits(
 ) -> None:
     """
     Process and insert GitCommit data into the database.
+
+    Without ``commits``, the history is streamed straight from ``git log``
+    in the repository's working directory.
     """
     logging.info("Processing git commits...")
     commit_batch: List[GitCommit] = []
     loop = asyncio.get_running_loop()
 
-    # If commits is None, we need to manually iterate using iter_commits
-    # But iter_commits_since is also in shared utils now? No, it takes 'repo' object.
-    # We'll expect the caller to pass the iterable or handle initialization.
-    # For now, if commits is None, we rely on the caller or fail?
-    # In main(), it's passed.
-
     if commits is None:
-        # We need to recreate the iterator logic if not provided
-        # This requires the gitpython Repo object, not our model Repo.
-        # The 'repo' arg here is our model Repo.
-        # This signature is slightly confusing in the original code.
-        # The original 'process_git_commits' took (repo: Repo, ...).
-        # But inside it called `commit.hexsha`.
-        # So 'commits' MUST be the iterator of GitPython objects.
-        logging.warning("No commits iterable provided to process_git_commits")
+        if not isinstance(getattr(repo, "working_dir", None), str):
+            logging.warning("No commits iterable provided to process_git_commits")
+            return
+        try:
+            await _queue_git_log_batches(
+                _iter_git_log_batches(repo.working_dir, repo.id, since),
+                store.insert_git_commit_data,
+                "commits",
+            )
+        except Exception as e:
+            logging.error(f"Error processing commits: {e}")
         return
 
     try:
         commit_count = 0
-        for commit in commits:
-            commit_dt = _normalize_datetime(commit.committed_datetime)
-            if since and commit_dt < since:
-                continue
-
-            # Run extraction in thread
-            git_commit, error = await loop.run_in_executor(
-                None, _extract_commit_info, commit, repo.id
-            )
+        async with _QueuedWriter() as writer:
+            for commit in commits:
+                commit_dt = _normalize_datetime(commit.committed_datetime)
+                if since and commit_dt < since:
+                    continue
+
+                # Run extraction in thread
+                git_commit, error = await loop.run_in_executor(
+                    None, _extract_commit_info, commit, repo.id
+                )
 
-            if error:
-                logging.warning(f"Skipping commit {commit.hexsha}: {error}")
-                continue
+                if error:
+                    logging.warning(f"Skipping commit {commit.hexsha}: {error}")
+                    continue
 
-            if git_commit:
-                commit_batch.append(git_commit)
-                commit_count += 1
+                if git_commit:
+                    commit_batch.append(git_commit)
+                    commit_count += 1
 
-            if len(commit_batch) >= BATCH_SIZE:
-                await store.insert_git_commit_data(commit_batch)
-                logging.info(f"Inserted {len(commit_batch)} commits")
-                commit_batch.clear()
+                if len(commit_batch) >= BATCH_SIZE:
+                    await writer.put(store.insert_git_commit_data, commit_batch)
+                    logging.info(f"Queued {len(commit_batch)} commits")
+                    commit_batch = []
 
-        # Insert remaining
-        if commit_batch:
-            await store.insert_git_commit_data(commit_batch)
-            logging.info(f"Inserted final {len(commit_batch)} commits")
+            # Insert remaining
+            if commit_batch:
+                await writer.put(store.insert_git_commit_data, commit_batch)
+                logging.info(f"Queued final {len(commit_batch)} commits")
 
     except Exception as e:
         logging.error(f"Error processing commits: {e}")
@@ -326,49 +583,75 @@ async def process_git_commit_stats(
 ) -> None:
     """
     Process and insert GitCommitStat data into the database.
+
+    Without ``commits``, per-file stats are streamed straight from
+    ``git log --raw --numstat`` in the repository's working directory.
     """
     logging.info("Processing git commit stats...")
     commit_stats_batch: List[GitCommitStat] = []
     loop = asyncio.get_running_loop()
 
     if commits is None:
-        logging.warning("No commits iterable provided to process_git_commit_stats")
+        if not isinstance(getattr(repo, "working_dir", None), str):
+            logging.warning("No commits iterable provided to process_git_commit_stats")
+            return
+        try:
+            await _queue_git_log_batches(
+                _iter_git_log_stat_batches(repo.working_dir, repo.id, since),
+                store.insert_git_commit_stats,
+                "commit stats",
+            )
+        except Exception as e:
+            logging.error(f"Error processing commit stats: {e}")
         return
 
     try:
         commit_count = 0
-        for commit in commits:
-            commit_dt = _normalize_datetime(commit.committed_datetime)
-            if since and commit_dt < since:
-                continue
+        async with _QueuedWriter() as writer:
+            for commit in commits:
+                commit_dt = _normalize_datetime(commit.committed_datetime)
+                if since and commit_dt < since:
+                    continue
+
+                # Run blocking git diff in executor
+                stats = await loop.run_in_executor(
+                    None, _compute_commit_stats_sync, commit, repo.id
+                )
 
-            # Run blocking git diff in executor
-            stats = await loop.run_in_executor(
-                None, _compute_commit_stats_sync, commit, repo.id
-            )
+                if stats:
+                    commit_stats_batch.extend(stats)
 
-            if stats:
-                commit_stats_batch.extend(stats)
+                commit_count += 1
 
-            commit_count += 1
+                if len(commit_stats_batch) >= BATCH_SIZE:
+                    await writer.put(store.insert_git_commit_stats, commit_stats_batch)
+                    logging.info(
+                        f"Queued {len(commit_stats_batch)} commit stats ({commit_count} commits)"
+                    )
+                    commit_stats_batch = []
 
-            if len(commit_stats_batch) >= BATCH_SIZE:
-                await store.insert_git_commit_stats(commit_stats_batch)
+            # Insert remaining stats
+            if commit_stats_batch:
+                await writer.put(store.insert_git_commit_stats, commit_stats_batch)
                 logging.info(
-                    f"Inserted {len(commit_stats_batch)} commit stats ({commit_count} commits)"
+                    f"Queued final {len(commit_stats_batch)} commit stats ({commit_count} commits)"
                 )
-                commit_stats_batch.clear()
-
-        # Insert remaining stats
-        if commit_stats_batch:
-            await store.insert_git_commit_stats(commit_stats_batch)
-            logging.info(
-                f"Inserted final {len(commit_stats_batch)} commit stats ({commit_count} commits)"
-            )
     except Exception as e:
         logging.error(f"Error processing commit stats: {e}")
 
 
+def _list_repo_files(repo_root: Path) -> List[Path]:
+    """Return resolved paths of every file in the work tree, outside ``.git``."""
+    all_files_path = []
+    for root, dirs, files in os.walk(str(repo_root)):
+        # Prune .git in place so its objects are never listed at all.
+        dirs[:] = [d for d in dirs if d != ".git"]
+        root_path = Path(root)
+        for file in files:
+            all_files_path.append((root_path / file).resolve())
+    return all_files_path
+
+
 def _process_file_and_blame_sync(
     filepath: Path, repo_id: uuid.UUID, repo_root: str, do_blame: bool
 ) -> Tuple[Optional[GitFile], List[GitBlame], Optional[str]]:
@@ -382,8 +665,9 @@ def _process_file_and_blame_sync(
         is_executable = os.access(filepath, os.X_OK)
         contents = None
         try:
-            if os.path.getsize(filepath) < 1_000_000:  # Skip files > 1MB
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+                # fstat the open handle rather than stat the path a second time.
+                if os.fstat(f.fileno()).st_size < 1_000_000:  # Skip files > 1MB
                     contents = f.read()
         except Exception:
             pass  # Content read failed, but we still proceed
@@ -440,23 +724,36 @@ async def process_files_and_blame(
     failed_files: List[Tuple[Path, str]] = []
 
     loop = asyncio.get_running_loop()
-    concurrency = MAX_WORKERS
-    semaphore = asyncio.Semaphore(concurrency)
-
-    async def _worker(filepath: Path):
-        async with semaphore:
-            do_blame = filepath in files_for_blame
-            return await loop.run_in_executor(
-                None,
-                _process_file_and_blame_sync,
-                filepath,
-                repo.id,
-                repo_root_path,
-                do_blame,
-            )
-
-    # Process results in chunks
-    chunk_size = BATCH_SIZE * 2
+    concurrency = max(1, min(MAX_WORKERS, len(all_files)))
+
+    # A fixed pool of workers drains the file queue and hands results back in
+    # completion order, so one slow file never holds up the rest.
+    work_q: asyncio.Queue = asyncio.Queue()
+    for filepath in all_files:
+        work_q.put_nowait(filepath)
+    results_q: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def _worker() -> None:
+        while True:
+            try:
+                filepath = work_q.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result: Union[
+                Tuple[Optional[GitFile], List[GitBlame], Optional[str]], Exception
+            ]
+            try:
+                result = await loop.run_in_executor(
+                    None,
+                    _process_file_and_blame_sync,
+                    filepath,
+                    repo.id,
+                    repo_root_path,
+                    filepath in files_for_blame,
+                )
+            except Exception as exc:
+                result = exc
+            await results_q.put((filepath, result))
 
     # Import tqdm for progress bar
     try:
@@ -491,61 +788,100 @@ async def process_files_and_blame(
     else:
         pbar = None
 
-    for i in range(0, len(all_files), chunk_size):
-        chunk_files = all_files[i : i + chunk_size]
-        chunk_tasks = [_worker(fp) for fp in chunk_files]
+    # Writes run on a background task so ongoing git work overlaps them.
+    async with _QueuedWriter() as writer:
+        workers = [asyncio.create_task(_worker()) for _ in range(concurrency)]
+        try:
+            for _ in range(len(all_files)):
+                original_file, result = await results_q.get()
 
-        results = await asyncio.gather(*chunk_tasks, return_exceptions=True)
+                if pbar:
+                    pbar.update(1)
 
-        for idx, result in enumerate(results):
-            original_file = chunk_files[idx]
+                if isinstance(result, Exception):
+                    logging.debug(f"Task failed for {original_file}: {result}")
+                    failed_files.append((original_file, str(result)))
+                    continue
 
-            if isinstance(result, Exception):
-                logging.debug(f"Task failed for {original_file}: {result}")
-                failed_files.append((original_file, str(result)))
-                continue
+                git_file, blame_rows, error = result
 
-            git_file, blame_rows, error = result
+                if error:
+                    logging.debug(f"Error processing {original_file}: {error}")
+                    failed_files.append((original_file, error))
+                    continue
 
-            if error:
-                logging.debug(f"Error processing {original_file}: {error}")
-                failed_files.append((original_file, error))
-                continue
+                if git_file:
+                    file_batch.append(git_file)
+
+                if blame_rows:
+                    blame_batch.extend(blame_rows)
 
-            if git_file:
-                file_batch.append(git_file)
+                # Flush batches
+                if len(file_batch) >= BATCH_SIZE:
+                    await writer.put(store.insert_git_file_data, file_batch)
+                    file_batch = []
 
-            if blame_rows:
-                blame_batch.extend(blame_rows)
+                if len(blame_batch) >= BATCH_SIZE:
+                    await writer.put(store.insert_blame_data, blame_batch)
+                    blame_batch = []
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-        # Update progress bar
+        # Close progress bar
         if pbar:
-            pbar.update(len(chunk_files))
+            pbar.close()
+
+        # Flush remaining
+        if file_batch:
+            await writer.put(store.insert_git_file_data, file_batch)
+            logging.info(f"Queued final {len(file_batch)} git files")
+
+        if blame_batch:
+            await writer.put(store.insert_blame_data, blame_batch)
+            logging.info(f"Queued final {len(blame_batch)} git blame lines")
 
-        # Flush batches
-        if len(file_batch) >= BATCH_SIZE:
-            await store.insert_git_file_data(file_batch)
-            file_batch.clear()
+    if failed_files:
+        logging.warning(f"Failed to process {len(failed_files)} files")
 
-        if len(blame_batch) >= BATCH_SIZE:
-            await store.insert_blame_data(blame_batch)
-            blame_batch.clear()
 
-    # Close progress bar
-    if pbar:
-        pbar.close()
+class _SerializedStore:
+    """
+    Let concurrently running sync stages share one store.
 
-    # Flush remaining
-    if file_batch:
-        await store.insert_git_file_data(file_batch)
-        logging.info(f"Inserted final {len(file_batch)} git files")
+    Coroutine methods are proxied behind a common lock, so a store whose
+    session cannot run statements concurrently still sees one call at a time.
+    Everything else is passed through untouched.
+    """
 
-    if blame_batch:
-        await store.insert_blame_data(blame_batch)
-        logging.info(f"Inserted final {len(blame_batch)} git blame lines")
+    def __init__(self, store: Any) -> None:
+        self._store = store
+        self._lock = asyncio.Lock()
 
-    if failed_files:
-        logging.warning(f"Failed to process {len(failed_files)} files")
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._store, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def locked(*args: Any, **kwargs: Any) -> Any:
+            async with self._lock:
+                return await attr(*args, **kwargs)
+
+        return locked
+
+
+async def _run_stages(stages: List[Awaitable[None]]) -> None:
+    """Run independent sync stages concurrently; a failure cancels the rest."""
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 async def process_local_repo(
@@ -560,7 +896,8 @@ async def process_local_repo(
     """
     Orchestrate the local repository sync pipeline.
 
-    Use the sync_* flags to control which stages run.
+    Use the sync_* flags to control which stages run. Selected stages run
+    concurrently, with their store calls serialized.
     """
     repo_root = Path(repo_path).resolve()
     logging.info("Processing local repository at %s", repo_root)
@@ -578,46 +915,47 @@ async def process_local_repo(
     repo_obj = GitPythonRepo(str(repo_root))
     commits_iter = list(iter_commits_since(repo_obj, since))
 
+    # The stages touch different tables, so they run side by side and only
+    # their store calls take turns.
+    shared_store = _SerializedStore(store)
+    stages: List[Awaitable[None]] = []
+
     if sync_git:
-        await process_git_commits(repo, store, commits_iter, since)
+        stages.append(process_git_commits(repo, shared_store, since=since))
+        stages.append(process_git_commit_stats(repo, shared_store, since=since))
 
     if sync_prs:
-        await process_local_pull_requests(
-            repo=repo,
-            store=store,
-            repo_obj=repo_obj,
-            commits=commits_iter,
-            since=since,
+        stages.append(
+            process_local_pull_requests(
+                repo=repo,
+                store=shared_store,
+                repo_obj=repo_obj,
+                commits=commits_iter,
+                since=since,
+            )
         )
 
-    if sync_git:
-        commits_for_stats = list(iter_commits_since(repo_obj, since))
-        await process_git_commit_stats(repo, store, commits_for_stats, since)
-
     if sync_blame or fetch_blame:
         files_for_blame = set()
         if fetch_blame:
             files_for_blame = set(collect_changed_files(repo_root, commits_iter))
 
-        all_files_path = []
-        for root, _, files in os.walk(str(repo_root)):
-            root_path = Path(root)
-            if ".git" in root_path.parts:
-                continue
-            for file in files:
-                file_path = (root_path / file).resolve()
-                all_files_path.append(file_path)
+        all_files_path = _list_repo_files(repo_root)
 
         files_for_blame_path = {Path(p).resolve() for p in files_for_blame}
 
-        await process_files_and_blame(
-            repo,
-            all_files_path,
-            files_for_blame_path,
-            store,
-            str(repo_root),
+        stages.append(
+            process_files_and_blame(
+                repo,
+                all_files_path,
+                files_for_blame_path,
+                shared_store,
+                str(repo_root),
+            )
         )
 
+    await _run_stages(stages)
+
     logging.info("Local repository processing complete.")
 
 
@@ -646,14 +984,7 @@ async def process_local_blame(
     commits_iter = list(iter_commits_since(repo_obj, since))
     files_for_blame = set(collect_changed_files(repo_root, commits_iter)) if commits_iter else set()
 
-    all_files_path = []
-    for root, _, files in os.walk(str(repo_root)):
-        root_path = Path(root)
-        if ".git" in root_path.parts:
-            continue
-        for file in files:
-            file_path = (root_path / file).resolve()
-            all_files_path.append(file_path)
+    all_files_path = _list_repo_files(repo_root)
 
     if not files_for_blame:
         files_for_blame_path = set(all_files_path)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Mapping, Optional, Sequence
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
 import yaml
 
@@ -32,6 +32,10 @@ class IdentityResolver:
     """
 
     alias_to_canonical: Mapping[str, str]
+    # Imports resolve the same few authors over and over; memoize per resolver.
+    _resolved: Dict[Tuple[Optional[str], ...], str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def resolve(
         self,
@@ -41,6 +45,28 @@ class IdentityResolver:
         username: Optional[str] = None,
         account_id: Optional[str] = None,
         display_name: Optional[str] = None,
+    ) -> str:
+        key = (provider, email, username, account_id, display_name)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(
+                provider=provider,
+                email=email,
+                username=username,
+                account_id=account_id,
+                display_name=display_name,
+            )
+            self._resolved[key] = resolved
+        return resolved
+
+    def _resolve(
+        self,
+        *,
+        provider: WorkItemProvider,
+        email: Optional[str],
+        username: Optional[str],
+        account_id: Optional[str],
+        display_name: Optional[str],
     ) -> str:
         if email:
             normalized = _norm_email(email)
@@ -17,6 +17,9 @@ from providers.identity import IdentityResolver
 from providers.status_mapping import StatusMapping
 
 
+_OFFSET_NO_COLON_RE = re.compile(r"([+-]\d{2})(\d{2})$")
+
+
 def _parse_datetime(value: Any) -> Optional[datetime]:
     if value is None:
         return None
@@ -27,9 +30,7 @@ def _parse_datetime(value: Any) -> Optional[datetime]:
         if not raw:
             return None
         # Jira commonly uses "+0000" offsets (no colon); normalize for fromisoformat.
-        raw = raw.replace("Z", "+00:00")
-        if re.search(r"[+-]\d{4}$", raw):
-            raw = raw[:-2] + ":" + raw[-2:]
+        raw = _OFFSET_NO_COLON_RE.sub(r"\1:\2", raw.replace("Z", "+00:00"))
         try:
             dt = datetime.fromisoformat(raw)
         except Exception:
@@ -81,47 +82,37 @@ def _parse_sprint(value: Any) -> Tuple[Optional[str], Optional[str]]:
     return sid, name
 
 
+# Markers match as whole words, so "p10" is not "p1" and "below" is not "low".
+_EXPEDITE_PRIORITY_RE = re.compile(r"\b(?:highest|critical|blocker|urgent|p0|p1)\b")
+_BACKGROUND_PRIORITY_RE = re.compile(r"\b(?:low|lowest|p4|p5)\b")
+
+
 def _service_class_from_priority(priority_raw: Optional[str]) -> str:
     if not priority_raw:
         return "standard"
     normalized = str(priority_raw).strip().lower()
-    expedite_markers = ("highest", "critical", "blocker", "urgent", "p0", "p1")
-    background_markers = ("low", "lowest", "p4", "p5")
-
-    def _matches_marker(text: str, markers: Tuple[str, ...]) -> bool:
-        """
-        Return True if `text` matches any marker exactly or contains it as a whole word.
-
-        This avoids substring false-positives such as:
-        - "p10" matching "p1"
-        - "below" matching "low"
-        """
-        for marker in markers:
-            if text == marker:
-                return True
-            pattern = r"\b" + re.escape(marker) + r"\b"
-            if re.search(pattern, text):
-                return True
-        return False
-
-    if _matches_marker(normalized, expedite_markers):
+    if _EXPEDITE_PRIORITY_RE.search(normalized):
         return "expedite"
-    if _matches_marker(normalized, background_markers):
+    if _BACKGROUND_PRIORITY_RE.search(normalized):
         return "background"
     return "standard"
 
 
+_BLOCKED_BY_RE = re.compile(r"\b(?:is\s+)?blocked by\b")
+_BLOCKS_RE = re.compile(r"\bblocks?\b")
+
+
 def _normalize_relationship_type(raw_value: Optional[str]) -> str:
     if not raw_value:
         return "other"
     normalized = str(raw_value).strip().lower()
     # Check "blocked by" relationships first, using word boundaries to avoid
     # accidental matches on longer words and to capture direction explicitly.
-    if re.search(r"\b(?:is\s+)?blocked by\b", normalized):
+    if _BLOCKED_BY_RE.search(normalized):
         return "blocked_by"
     # Then check for "block"/"blocks" as standalone words to avoid matching
     # unrelated strings like "blocker" or "blocking".
-    if re.search(r"\bblocks?\b", normalized):
+    if _BLOCKS_RE.search(normalized):
         return "blocks"
     if "relate" in normalized:
         return "relates"
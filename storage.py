@@ -1,21 +1,62 @@
 import asyncio
+import functools
+import hashlib
 import json
+import operator
+import time
 import uuid
+import weakref
 from collections.abc import Iterable
 from dataclasses import asdict
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union, TYPE_CHECKING
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
+from bson import encode as bson_encode
+from bson.raw_bson import RawBSONDocument
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import UpdateOne
-from pymongo.errors import ConfigurationError
-from sqlalchemy import Column, Float, Integer, MetaData, String, Table, and_, func, select
+from pymongo.errors import ConfigurationError, DuplicateKeyError
+from sqlalchemy import (
+    Column,
+    event,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    column as sa_column,
+    func,
+    literal,
+    select,
+    table as sa_table,
+    text,
+)
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from models.git import (
     GitBlame,
@@ -29,6 +70,19 @@ from models.git import (
     Incident,
     Repo,
 )
+from utils import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    INSERT_BUFFER_ROWS,
+)
+
+# Below this many rows a plain executemany upsert beats setting up a COPY.
+_COPY_MIN_ROWS = 1_000
+# Unordered Mongo bulk writes are split into concurrent shards of at least
+# this many operations; the server applies each bulk serially.
+_MONGO_SHARD_MIN_OPS = 500
+_MONGO_MAX_SHARDS = 8
 
 if TYPE_CHECKING:
     from metrics.schemas import FileComplexitySnapshot
@@ -62,6 +116,22 @@ def _parse_datetime_value(value: Any) -> Optional[datetime]:
         return None
 
 
+# Connection string schemes (lowercased) understood by detect_db_type.
+_DB_SCHEMES = {
+    "clickhouse": "clickhouse",
+    "clickhouse+http": "clickhouse",
+    "clickhouse+https": "clickhouse",
+    "clickhouse+native": "clickhouse",
+    "mongodb": "mongo",
+    "mongodb+srv": "mongo",
+    "postgresql": "postgres",
+    "postgres": "postgres",
+    "postgresql+asyncpg": "postgres",
+    "sqlite": "sqlite",
+    "sqlite+aiosqlite": "sqlite",
+}
+
+
 def detect_db_type(conn_string: str) -> str:
     """
     Detect database type from connection string.
@@ -73,34 +143,14 @@ def detect_db_type(conn_string: str) -> str:
     if not conn_string:
         raise ValueError("Connection string is required")
 
-    conn_lower = conn_string.lower()
-
-    # ClickHouse connection strings
-    if conn_lower.startswith("clickhouse://") or conn_lower.startswith((
-        "clickhouse+http://",
-        "clickhouse+https://",
-        "clickhouse+native://",
-    )):
-        return "clickhouse"
-
-    # MongoDB connection strings
-    if conn_lower.startswith("mongodb://") or conn_lower.startswith("mongodb+srv://"):
-        return "mongo"
-
-    # PostgreSQL connection strings
-    if conn_lower.startswith("postgresql://") or conn_lower.startswith("postgres://"):
-        return "postgres"
-    if conn_lower.startswith("postgresql+asyncpg://"):
-        return "postgres"
-
-    # SQLite connection strings
-    if conn_lower.startswith("sqlite://") or conn_lower.startswith(
-        "sqlite+aiosqlite://"
-    ):
-        return "sqlite"
-
-    # Extract scheme for better error reporting
-    scheme = conn_string.split("://", 1)[0] if "://" in conn_string else "unknown"
+    # Only the scheme is lowercased; URLs can carry long query strings.
+    scheme, sep, _ = conn_string.partition("://")
+    db_type = _DB_SCHEMES.get(scheme.lower()) if sep else None
+    if db_type is not None:
+        return db_type
+
+    if not sep:
+        scheme = "unknown"
     raise ValueError(
         f"Could not detect database type from connection string. "
         f"Supported: mongodb://, postgresql://, postgres://, sqlite://, "
@@ -153,36 +203,216 @@ def _serialize_value(value: Any) -> Any:
     return value
 
 
+@functools.lru_cache(maxsize=None)
+def _model_column_keys(model_cls: type) -> Tuple[str, ...]:
+    """Return the mapped column keys for a SQLAlchemy model class."""
+    return tuple(col.key for col in inspect(model_cls).columns)
+
+
 def model_to_dict(model: Any) -> Dict[str, Any]:
     """Convert a SQLAlchemy model instance to a plain dict."""
-    mapper = inspect(model.__class__)
-    data: Dict[str, Any] = {}
-    for column in mapper.columns:
-        data[column.key] = _serialize_value(getattr(model, column.key))
-    return data
+    return {
+        key: _serialize_value(getattr(model, key))
+        for key in _model_column_keys(type(model))
+    }
 
 
-class SQLAlchemyStore:
-    """Async storage implementation backed by SQLAlchemy."""
+def _bulk_shards(items: List[Any]) -> List[List[Any]]:
+    """
+    Split a bulk write into contiguous shards to send concurrently.
 
-    def __init__(self, conn_string: str, echo: bool = False) -> None:
-        # Configure connection pool for better performance (PostgreSQL/MySQL only)
-        engine_kwargs = {"echo": echo}
+    Batches under ``_MONGO_SHARD_MIN_OPS`` stay whole; larger ones get one
+    shard per ``_MONGO_SHARD_MIN_OPS`` operations, up to ``_MONGO_MAX_SHARDS``.
+    """
+    count = min(_MONGO_MAX_SHARDS, max(1, len(items) // _MONGO_SHARD_MIN_OPS))
+    size = -(-len(items) // count)
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def _encode_raw_bson(
+    docs: List[Dict[str, Any]],
+) -> List[Tuple[RawBSONDocument, bytes]]:
+    """
+    Pre-encode documents so the Mongo driver can skip per-document encoding.
 
-        # Only add pooling parameters for databases that support them
-        if "sqlite" not in conn_string.lower():
+    Each document is stamped with ``_h``, a short hash of its encoded body, so
+    a later sync can tell whether the stored copy is already up to date.
+    """
+    encoded = []
+    for doc in docs:
+        body = bson_encode(doc)
+        digest = hashlib.blake2b(body, digest_size=8).digest()
+        # Append ``_h`` as a binary (subtype 0) element instead of re-encoding.
+        element = b"\x05_h\x00" + len(digest).to_bytes(4, "little") + b"\x00" + digest
+        size = len(body) + len(element)
+        raw = size.to_bytes(4, "little") + body[4:-1] + element + b"\x00"
+        encoded.append((RawBSONDocument(raw), digest))
+    return encoded
+
+
+class _BufferedInserter:
+    """
+    Coalesce small insert batches per table into fewer, larger store writes.
+
+    Rows are queued in memory and handed to the table's writer once the queue
+    reaches ``max_rows`` or its oldest row is older than ``max_delay_ms``.
+    With ``max_rows <= 0`` every batch is written through immediately.
+    """
+
+    def __init__(
+        self,
+        writers: Dict[str, Callable[[List[Any]], Awaitable[None]]],
+        max_rows: int = 0,
+        max_delay_ms: int = 200,
+    ) -> None:
+        self.writers = writers
+        self.max_rows = max_rows
+        self.max_delay_ms = max_delay_ms
+        self.queue: Dict[str, List[Any]] = {}
+        self._queued_at: Dict[str, float] = {}
+
+    def extend(self, table: str, rows: Iterable[Any]) -> None:
+        pending = self.queue.setdefault(table, [])
+        if not pending:
+            self._queued_at[table] = time.monotonic()
+        pending.extend(rows)
+
+    async def maybe_flush(self) -> None:
+        deadline = time.monotonic() - self.max_delay_ms / 1000.0
+        for table in list(self.queue):
+            if (
+                len(self.queue[table]) >= self.max_rows
+                or self._queued_at.get(table, 0.0) <= deadline
+            ):
+                await self.flush(table)
+
+    async def flush(self, table: str) -> None:
+        rows = self.queue.pop(table, None)
+        self._queued_at.pop(table, None)
+        if rows:
+            await self.writers[table](rows)
+
+    async def flush_all(self) -> None:
+        for table in list(self.queue):
+            await self.flush(table)
+
+
+# Pooled engines are shared by every SQLAlchemyStore on the same event loop,
+# keyed by (conn_string, echo). asyncpg connections cannot cross loops, and
+# each asyncio.run() in the CLI gets a fresh one.
+_SHARED_ENGINES: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, bool], AsyncEngine]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _engine_kwargs(conn_string: str, echo: bool) -> Dict[str, Any]:
+    # Configure connection pool for better performance (PostgreSQL/MySQL only)
+    engine_kwargs: Dict[str, Any] = {"echo": echo}
+
+    # Only add pooling parameters for databases that support them
+    if "sqlite" not in conn_string.lower():
+        if DB_POOL_SIZE == 0:
+            # Open a fresh connection per checkout (e.g. serverless runs).
+            engine_kwargs["poolclass"] = NullPool
+        else:
             engine_kwargs.update({
-                "pool_size": 20,  # Increased from default 5
-                "max_overflow": 30,  # Increased from default 10
+                "pool_size": DB_POOL_SIZE,
+                "max_overflow": DB_MAX_OVERFLOW,
+                "pool_timeout": DB_POOL_TIMEOUT,
+                "pool_use_lifo": True,  # Keep a warm working set; idle extras age out
                 "pool_pre_ping": True,  # Verify connections before using
                 "pool_recycle": 3600,  # Recycle connections after 1 hour
             })
+    return engine_kwargs
 
-        self.engine = create_async_engine(conn_string, **engine_kwargs)
-        self.session_factory = sessionmaker(
-            self.engine, expire_on_commit=False, class_=AsyncSession
-        )
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the
+# writer, and a larger in-process page cache keeps hot pages out of the OS.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _get_engine(conn_string: str, echo: bool = False) -> Tuple[AsyncEngine, bool]:
+    """
+    Return an engine for ``conn_string`` and whether it is shared.
+
+    Pooled engines are reused across stores on the running event loop.
+    SQLite engines, and any engine created outside a running loop, stay
+    private to the caller, which is responsible for disposing them.
+    """
+    kwargs = _engine_kwargs(conn_string, echo)
+    if "sqlite" in conn_string.lower():
+        engine = create_async_engine(conn_string, **kwargs)
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return engine, False
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return create_async_engine(conn_string, **kwargs), False
+
+    engines = _SHARED_ENGINES.setdefault(loop, {})
+    key = (conn_string, echo)
+    if key not in engines:
+        engines[key] = create_async_engine(conn_string, **kwargs)
+    return engines[key], True
+
+
+async def close_all_engines() -> None:
+    """Dispose the engines shared by stores on the running event loop."""
+    engines = _SHARED_ENGINES.pop(asyncio.get_running_loop(), {})
+    for engine in engines.values():
+        await engine.dispose()
+
+
+class SQLAlchemyStore:
+    """Async storage implementation backed by SQLAlchemy."""
+
+    def __init__(self, conn_string: str, echo: bool = False) -> None:
+        self.conn_string = conn_string
+        self.echo = echo
+        self._engine: Optional[AsyncEngine] = None
+        self._owns_engine = True
+        self._session_factory: Optional[sessionmaker] = None
+        # Upsert constructs are immutable; build each shape once per store.
+        self._upsert_statements: Dict[Tuple[Any, Tuple[str, ...], Tuple[str, ...]], Any] = {}
         self.session: Optional[AsyncSession] = None
+        # Single-statement probes and upserts skip the session's BEGIN/COMMIT.
+        self._autocommit_conn: Optional[AsyncConnection] = None
+        # One timestamp per store session so every row written in a sync run
+        # shares the same last_synced default.
+        self._sync_started_at: Optional[datetime] = None
+        self._insert_buffer = _BufferedInserter(
+            {"git_blame": self._write_blame_data}, max_rows=INSERT_BUFFER_ROWS
+        )
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine, shared = _get_engine(self.conn_string, self.echo)
+            self._owns_engine = not shared
+        return self._engine
+
+    @property
+    def session_factory(self) -> sessionmaker:
+        if self._session_factory is None:
+            # Writes go through Core statements, so there is nothing to autoflush.
+            self._session_factory = sessionmaker(
+                self.engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
+            )
+        return self._session_factory
 
     def _insert_for_dialect(self, model: Any):
         dialect = self.engine.dialect.name
@@ -198,21 +428,81 @@ class SQLAlchemyStore:
         rows: List[Dict[str, Any]],
         conflict_columns: List[str],
         update_columns: List[str],
+        use_copy: bool = False,
     ) -> None:
         if not rows:
             return
         assert self.session is not None
 
-        stmt = self._insert_for_dialect(model)
+        if (
+            use_copy
+            and len(rows) >= _COPY_MIN_ROWS
+            and self.engine.dialect.driver == "asyncpg"
+        ):
+            await self._copy_upsert_many(model, rows, conflict_columns, update_columns)
+            return
+
+        key = (model, tuple(conflict_columns), tuple(update_columns))
+        stmt = self._upsert_statements.get(key)
+        if stmt is None:
+            stmt = self._insert_for_dialect(model)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[getattr(model, col) for col in conflict_columns],
+                set_={col: getattr(stmt.excluded, col) for col in update_columns},
+            )
+            self._upsert_statements[key] = stmt
+        await self.session.execute(stmt, rows)
+        await self.session.commit()
+
+    async def _copy_upsert_many(
+        self,
+        model: Any,
+        rows: List[Dict[str, Any]],
+        conflict_columns: List[str],
+        update_columns: List[str],
+    ) -> None:
+        """
+        Stream rows into a staging table with asyncpg COPY, then upsert from it.
+
+        COPY cannot resolve conflicts, so rows land in a transaction-scoped
+        temp table first and one INSERT ... SELECT ... ON CONFLICT merges them.
+        """
+        assert self.session is not None
+        target = model.__table__.name
+        staging_name = f"_copy_{target}"
+        columns = list(rows[0].keys())
+        # ON CONFLICT cannot touch the same row twice in one statement; keep
+        # the last row per key, as the executemany path would.
+        latest = {tuple(row[col] for col in conflict_columns): row for row in rows}
+
+        conn = await self.session.connection()
+        # Go through SQLAlchemy first so the COPY below runs inside the
+        # session's transaction and the staged rows are cleared on commit.
+        await conn.execute(
+            text(
+                f'CREATE TEMP TABLE IF NOT EXISTS "{staging_name}" '
+                f'(LIKE "{target}" INCLUDING DEFAULTS) ON COMMIT DELETE ROWS'
+            )
+        )
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            staging_name,
+            records=[tuple(row[col] for col in columns) for row in latest.values()],
+            columns=columns,
+        )
+
+        staging = sa_table(staging_name, *[sa_column(col) for col in columns])
+        stmt = pg_insert(model).from_select(columns, select(*staging.c))
         stmt = stmt.on_conflict_do_update(
             index_elements=[getattr(model, col) for col in conflict_columns],
             set_={col: getattr(stmt.excluded, col) for col in update_columns},
         )
-        await self.session.execute(stmt, rows)
+        await conn.execute(stmt)
         await self.session.commit()
 
     async def __aenter__(self) -> "SQLAlchemyStore":
         self.session = self.session_factory()
+        self._sync_started_at = datetime.now(timezone.utc)
 
         # Create tables for SQLite automatically
         if "sqlite" in str(self.engine.url):
@@ -225,9 +515,15 @@ class SQLAlchemyStore:
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         if self.session is not None:
+            await self._insert_buffer.flush_all()
             await self.session.close()
             self.session = None
-        await self.engine.dispose()
+        if self._autocommit_conn is not None:
+            await self._autocommit_conn.close()
+            self._autocommit_conn = None
+        # Shared engines stay warm for the next store; see close_all_engines().
+        if self._engine is not None and self._owns_engine:
+            await self._engine.dispose()
 
     async def ensure_tables(self) -> None:
         from models.git import Base
@@ -238,11 +534,34 @@ class SQLAlchemyStore:
 
     async def insert_repo(self, repo: Repo) -> None:
         assert self.session is not None
-        existing_repo = await self.session.get(Repo, repo.id)
-        if not existing_repo:
-            self.session.add(repo)
+        # Leave unset columns out so their Python-side defaults still apply.
+        values = {
+            column.key: getattr(repo, column.key)
+            for column in inspect(Repo).columns
+            if getattr(repo, column.key) is not None
+        }
+        stmt = self._insert_for_dialect(Repo).values(**values)
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Repo.id])
+        if await self._execute_autocommit(stmt) is None:
+            await self.session.execute(stmt)
             await self.session.commit()
 
+    async def _execute_autocommit(self, stmt: Any) -> Optional[Any]:
+        """
+        Run a single statement on an AUTOCOMMIT connection, outside the session.
+
+        Returns None on SQLite, whose in-memory databases only exist on the
+        session's connection; callers fall back to the session there.
+        """
+        if self.engine.dialect.name == "sqlite":
+            return None
+        if self._autocommit_conn is None:
+            conn = await self.engine.connect()
+            self._autocommit_conn = await conn.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+        return await self._autocommit_conn.execute(stmt)
+
     async def get_all_repos(self) -> List[Repo]:
         assert self.session is not None
         result = await self.session.execute(select(Repo))
@@ -439,35 +758,51 @@ class SQLAlchemyStore:
             )
         return out
 
-    async def has_any_git_files(self, repo_id) -> bool:
+    async def _has_any(self, model: Any, repo_id) -> bool:
         assert self.session is not None
-        result = await self.session.execute(
-            select(func.count()).select_from(GitFile).where(GitFile.repo_id == repo_id)
-        )
-        return (result.scalar() or 0) > 0
+        stmt = select(literal(1)).select_from(model).where(model.repo_id == repo_id).limit(1)
+        result = await self._execute_autocommit(stmt)
+        if result is None:
+            result = await self.session.execute(stmt)
+        return result.first() is not None
+
+    async def has_any_git_files(self, repo_id) -> bool:
+        return await self._has_any(GitFile, repo_id)
 
     async def has_any_git_commit_stats(self, repo_id) -> bool:
-        assert self.session is not None
-        result = await self.session.execute(
-            select(func.count())
-            .select_from(GitCommitStat)
-            .where(GitCommitStat.repo_id == repo_id)
-        )
-        return (result.scalar() or 0) > 0
+        return await self._has_any(GitCommitStat, repo_id)
 
     async def has_any_git_blame(self, repo_id) -> bool:
+        await self._insert_buffer.flush("git_blame")
+        return await self._has_any(GitBlame, repo_id)
+
+    async def existence_snapshot(self, repo_id) -> Dict[str, bool]:
+        """Report which per-repo git tables already hold rows, in one query."""
         assert self.session is not None
-        result = await self.session.execute(
-            select(func.count())
-            .select_from(GitBlame)
+        await self._insert_buffer.flush("git_blame")
+        stmt = select(
+            select(GitFile.repo_id)
+            .where(GitFile.repo_id == repo_id)
+            .exists()
+            .label("git_files"),
+            select(GitCommitStat.repo_id)
+            .where(GitCommitStat.repo_id == repo_id)
+            .exists()
+            .label("git_commit_stats"),
+            select(GitBlame.repo_id)
             .where(GitBlame.repo_id == repo_id)
+            .exists()
+            .label("git_blame"),
         )
-        return (result.scalar() or 0) > 0
+        result = await self._execute_autocommit(stmt)
+        if result is None:
+            result = await self.session.execute(stmt)
+        return {key: bool(value) for key, value in result.one()._mapping.items()}
 
     async def insert_git_file_data(self, file_data: List[GitFile]) -> None:
         if not file_data:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in file_data:
             if isinstance(item, dict):
@@ -495,12 +830,13 @@ class SQLAlchemyStore:
             rows,
             conflict_columns=["repo_id", "path"],
             update_columns=["executable", "contents", "last_synced"],
+            use_copy=True,
         )
 
     async def insert_git_commit_data(self, commit_data: List[GitCommit]) -> None:
         if not commit_data:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in commit_data:
             if isinstance(item, dict):
@@ -550,12 +886,13 @@ class SQLAlchemyStore:
                 "parents",
                 "last_synced",
             ],
+            use_copy=True,
         )
 
     async def insert_git_commit_stats(self, commit_stats: List[GitCommitStat]) -> None:
         if not commit_stats:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in commit_stats:
             if isinstance(item, dict):
@@ -599,12 +936,17 @@ class SQLAlchemyStore:
                 "new_file_mode",
                 "last_synced",
             ],
+            use_copy=True,
         )
 
     async def insert_blame_data(self, data_batch: List[GitBlame]) -> None:
         if not data_batch:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        self._insert_buffer.extend("git_blame", data_batch)
+        await self._insert_buffer.maybe_flush()
+
+    async def _write_blame_data(self, data_batch: List[GitBlame]) -> None:
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in data_batch:
             if isinstance(item, dict):
@@ -647,12 +989,13 @@ class SQLAlchemyStore:
                 "line",
                 "last_synced",
             ],
+            use_copy=True,
         )
 
     async def insert_git_pull_requests(self, pr_data: List[GitPullRequest]) -> None:
         if not pr_data:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in pr_data:
             if isinstance(item, dict):
@@ -738,7 +1081,7 @@ class SQLAlchemyStore:
     ) -> None:
         if not review_data:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in review_data:
             if isinstance(item, dict):
@@ -782,7 +1125,7 @@ class SQLAlchemyStore:
     ) -> None:
         if not runs:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in runs:
             if isinstance(item, dict):
@@ -825,7 +1168,7 @@ class SQLAlchemyStore:
     async def insert_deployments(self, deployments: List[Deployment]) -> None:
         if not deployments:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in deployments:
             if isinstance(item, dict):
@@ -877,7 +1220,7 @@ class SQLAlchemyStore:
     async def insert_incidents(self, incidents: List[Incident]) -> None:
         if not incidents:
             return
-        synced_at_default = datetime.now(timezone.utc)
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in incidents:
             if isinstance(item, dict):
@@ -948,15 +1291,35 @@ class SQLAlchemyStore:
         return list(result.scalars().all())
 
 
+# Compound indexes on the natural keys of the git collections. Upserts match
+# on the synthetic _id, but has_any_* and repo-scoped reads filter on repo_id,
+# which every index below has as its prefix.
+_MONGO_GIT_INDEXES: Dict[str, Tuple[str, ...]] = {
+    "git_files": ("repo_id", "path"),
+    "git_commits": ("repo_id", "hash"),
+    "git_commit_stats": ("repo_id", "commit_hash", "file_path"),
+    "git_blame": ("repo_id", "path", "line_no"),
+    "git_pull_requests": ("repo_id", "number"),
+}
+# (conn_string, db name) pairs already indexed by this process.
+_MONGO_INDEXED_DBS: set = set()
+
+
 class MongoStore:
     """Async storage implementation backed by MongoDB (via Motor)."""
 
     def __init__(self, conn_string: str, db_name: Optional[str] = None) -> None:
         if not conn_string:
             raise ValueError("MongoDB connection string is required")
+        self.conn_string = conn_string
         self.client = AsyncIOMotorClient(conn_string)
         self.db_name = db_name
         self.db = None
+        self._insert_buffer = _BufferedInserter(
+            {"git_blame": self._write_blame_data}, max_rows=INSERT_BUFFER_ROWS
+        )
+        # collection -> whether it held any documents when first written this run
+        self._had_documents: Dict[str, bool] = {}
 
     async def __aenter__(self) -> "MongoStore":
         if self.db_name:
@@ -973,17 +1336,36 @@ class MongoStore:
                     "either via the MONGO_DB_NAME environment variable or include it "
                     "in your MongoDB connection string (e.g., 'mongodb://localhost:27017/mydb')"
                 )
+        await self.ensure_indexes()
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._insert_buffer.flush_all()
         self.client.close()
 
+    async def ensure_indexes(self) -> None:
+        key = (self.conn_string, self.db.name)
+        if key in _MONGO_INDEXED_DBS:
+            return
+        await asyncio.gather(
+            *(
+                self.db[collection].create_index([(field, 1) for field in fields])
+                for collection, fields in _MONGO_GIT_INDEXES.items()
+            )
+        )
+        _MONGO_INDEXED_DBS.add(key)
+
     async def insert_repo(self, repo: Repo) -> None:
         doc = model_to_dict(repo)
         doc["_id"] = doc["id"]
-        await self.db["repos"].update_one(
-            {"_id": doc["_id"]}, {"$set": doc}, upsert=True
-        )
+        # Most syncs see a repo for the first time; a plain insert skips the
+        # upsert's query phase and only falls back to it on a duplicate key.
+        try:
+            await self.db["repos"].insert_one(doc)
+        except DuplicateKeyError:
+            await self.db["repos"].update_one(
+                {"_id": doc["_id"]}, {"$set": doc}, upsert=True
+            )
 
     async def get_all_repos(self) -> List[Repo]:
         cursor = self.db["repos"].find({})
@@ -1132,68 +1514,75 @@ class MongoStore:
             )
         return out
 
-    async def has_any_git_files(self, repo_id) -> bool:
-        repo_id_val = _serialize_value(repo_id)
-        count = await self.db["git_files"].count_documents(
-            {"repo_id": repo_id_val}, limit=1
+    async def _has_any(self, collection: str, repo_id) -> bool:
+        doc = await self.db[collection].find_one(
+            {"repo_id": _serialize_value(repo_id)}, projection={"_id": 1}
         )
-        return count > 0
+        return doc is not None
+
+    async def has_any_git_files(self, repo_id) -> bool:
+        return await self._has_any("git_files", repo_id)
 
     async def has_any_git_commit_stats(self, repo_id) -> bool:
-        repo_id_val = _serialize_value(repo_id)
-        count = await self.db["git_commit_stats"].count_documents(
-            {"repo_id": repo_id_val}, limit=1
-        )
-        return count > 0
+        return await self._has_any("git_commit_stats", repo_id)
 
     async def has_any_git_blame(self, repo_id) -> bool:
-        repo_id_val = _serialize_value(repo_id)
-        count = await self.db["git_blame"].count_documents(
-            {"repo_id": repo_id_val}, limit=1
+        await self._insert_buffer.flush("git_blame")
+        return await self._has_any("git_blame", repo_id)
+
+    async def existence_snapshot(self, repo_id) -> Dict[str, bool]:
+        """Report which per-repo git collections already hold documents."""
+        # $facet cannot span collections, so issue the probes concurrently.
+        files, commit_stats, blame = await asyncio.gather(
+            self.has_any_git_files(repo_id),
+            self.has_any_git_commit_stats(repo_id),
+            self.has_any_git_blame(repo_id),
         )
-        return count > 0
+        return {
+            "git_files": files,
+            "git_commit_stats": commit_stats,
+            "git_blame": blame,
+        }
 
     async def insert_git_file_data(self, file_data: List[GitFile]) -> None:
         await self._upsert_many(
             "git_files",
             file_data,
-            lambda obj: f"{getattr(obj, 'repo_id')}:{getattr(obj, 'path')}",
+            id_fields=("repo_id", "path"),
         )
 
     async def insert_git_commit_data(self, commit_data: List[GitCommit]) -> None:
         await self._upsert_many(
             "git_commits",
             commit_data,
-            lambda obj: f"{getattr(obj, 'repo_id')}:{getattr(obj, 'hash')}",
+            id_fields=("repo_id", "hash"),
         )
 
     async def insert_git_commit_stats(self, commit_stats: List[GitCommitStat]) -> None:
         await self._upsert_many(
             "git_commit_stats",
             commit_stats,
-            lambda obj: (
-                f"{getattr(obj, 'repo_id')}:"
-                f"{getattr(obj, 'commit_hash')}:"
-                f"{getattr(obj, 'file_path')}"
-            ),
+            id_fields=("repo_id", "commit_hash", "file_path"),
         )
 
     async def insert_blame_data(self, data_batch: List[GitBlame]) -> None:
+        if not data_batch:
+            return
+        self._insert_buffer.extend("git_blame", data_batch)
+        await self._insert_buffer.maybe_flush()
+
+    async def _write_blame_data(self, data_batch: List[GitBlame]) -> None:
         await self._upsert_many(
             "git_blame",
             data_batch,
-            lambda obj: (
-                f"{getattr(obj, 'repo_id')}:"
-                f"{getattr(obj, 'path')}:"
-                f"{getattr(obj, 'line_no')}"
-            ),
+            id_fields=("repo_id", "path", "line_no"),
         )
 
     async def insert_git_pull_requests(self, pr_data: List[GitPullRequest]) -> None:
         await self._upsert_many(
             "git_pull_requests",
             pr_data,
-            lambda obj: f"{getattr(obj, 'repo_id')}:{getattr(obj, 'number')}",
+            id_fields=("repo_id", "number"),
         )
 
     async def insert_git_pull_request_reviews(
@@ -1202,9 +1591,7 @@ class MongoStore:
         await self._upsert_many(
             "git_pull_request_reviews",
             review_data,
-            lambda obj: (
-                f"{getattr(obj, 'repo_id')}:{getattr(obj, 'number')}:{getattr(obj, 'review_id')}"
-            ),
+            id_fields=("repo_id", "number", "review_id"),
         )
 
     async def insert_ci_pipeline_runs(self, runs: List[CiPipelineRun]) -> None:
@@ -1324,14 +1711,14 @@ class MongoStore:
         await self._upsert_many(
             "deployments",
             deployments,
-            lambda obj: f"{getattr(obj, 'repo_id')}:{getattr(obj, 'deployment_id')}",
+            id_fields=("repo_id", "deployment_id"),
         )
 
     async def insert_incidents(self, incidents: List[Incident]) -> None:
         await self._upsert_many(
             "incidents",
             incidents,
-            lambda obj: f"{getattr(obj, 'repo_id')}:{getattr(obj, 'incident_id')}",
+            id_fields=("repo_id", "incident_id"),
         )
 
     async def insert_teams(self, teams: List["Team"]) -> None:
@@ -1339,7 +1726,7 @@ class MongoStore:
         await self._upsert_many(
             "teams",
             teams,
-            lambda obj: str(getattr(obj, "id")),
+            id_fields=("id",),
         )
 
     async def get_all_teams(self) -> List["Team"]:
@@ -1363,21 +1750,215 @@ class MongoStore:
         self,
         collection: str,
         payload: Iterable[Any],
-        id_builder: Callable[[Any], str],
+        id_builder: Optional[Callable[[Any], str]] = None,
+        id_fields: Sequence[str] = (),
     ) -> None:
+        """
+        Write documents keyed by ``_id``.
+
+        Documents that already carry an ``_id`` keep it. Otherwise the key is
+        ``id_builder(item)`` or, more cheaply, the ``id_fields`` values of the
+        serialized document joined with ``":"``.
+
+        Upserts skip documents whose stored ``_h`` content hash matches, so
+        re-syncing unchanged data costs one ``_id`` lookup instead of a write.
+        That lookup is skipped for collections that were empty when this store
+        first wrote to them, where nothing could match.
+        """
+        ids = []
         docs = []
         for item in payload:
             doc = model_to_dict(item) if not isinstance(item, dict) else dict(item)
-            doc["_id"] = id_builder(item)
+            doc.pop("_h", None)
+            if "_id" not in doc:
+                if id_builder is not None:
+                    doc["_id"] = id_builder(item)
+                else:
+                    doc["_id"] = ":".join([str(doc[field]) for field in id_fields])
+            ids.append(doc["_id"])
             docs.append(doc)
 
         if not docs:
             return
 
-        operations = [
-            UpdateOne({"_id": doc["_id"]}, {"$set": doc}, upsert=True) for doc in docs
-        ]
-        await self.db[collection].bulk_write(operations, ordered=False)
+        # Encode to BSON once, off the event loop; the driver sends
+        # RawBSONDocument bytes as-is instead of re-encoding on this thread.
+        encoded = await asyncio.to_thread(_encode_raw_bson, docs)
+        entries = [(doc_id, raw, digest) for doc_id, (raw, digest) in zip(ids, encoded)]
+
+        if await self._collection_had_documents(collection):
+            entries = await self._drop_unchanged(collection, entries)
+            if not entries:
+                return
+
+        await asyncio.gather(
+            *(
+                self.db[collection].bulk_write(
+                    [
+                        UpdateOne({"_id": doc_id}, {"$set": raw}, upsert=True)
+                        for doc_id, raw, _ in shard
+                    ],
+                    ordered=False,
+                )
+                for shard in _bulk_shards(entries)
+            )
+        )
+
+    async def _collection_had_documents(self, collection: str) -> bool:
+        """Return whether ``collection`` held documents before this run wrote to it."""
+        if collection not in self._had_documents:
+            existing = await self.db[collection].find_one({}, {"_id": 1})
+            self._had_documents[collection] = existing is not None
+        return self._had_documents[collection]
+
+    async def _drop_unchanged(
+        self, collection: str, entries: List[Tuple[Any, RawBSONDocument, bytes]]
+    ) -> List[Tuple[Any, RawBSONDocument, bytes]]:
+        """Drop entries whose stored ``_h`` hash already matches, so re-syncs skip them."""
+        stored: Dict[Any, Any] = {}
+        cursor = self.db[collection].find(
+            {"_id": {"$in": [doc_id for doc_id, _, _ in entries]}}, {"_h": 1}
+        )
+        async for doc in cursor:
+            stored[doc["_id"]] = doc.get("_h")
+        return [entry for entry in entries if stored.get(entry[0]) != entry[2]]
+
+
+class _GitFileRow(NamedTuple):
+    repo_id: uuid.UUID
+    path: Optional[str]
+    executable: int
+    contents: Optional[str]
+    last_synced: Any
+
+
+class _GitCommitRow(NamedTuple):
+    repo_id: uuid.UUID
+    hash: Optional[str]
+    message: Optional[str]
+    author_name: Optional[str]
+    author_email: Optional[str]
+    author_when: Any
+    committer_name: Optional[str]
+    committer_email: Optional[str]
+    committer_when: Any
+    parents: int
+    last_synced: Any
+
+
+class _GitCommitStatRow(NamedTuple):
+    repo_id: uuid.UUID
+    commit_hash: Optional[str]
+    file_path: Optional[str]
+    additions: int
+    deletions: int
+    old_file_mode: str
+    new_file_mode: str
+    last_synced: Any
+
+
+class _GitBlameRow(NamedTuple):
+    repo_id: uuid.UUID
+    path: Optional[str]
+    line_no: int
+    author_email: Optional[str]
+    author_name: Optional[str]
+    author_when: Any
+    commit_hash: Optional[str]
+    line: Optional[str]
+    last_synced: Any
+
+
+# Fields every commit/blame dict row is expected to carry; fetched with one
+# C-level itemgetter call instead of a .get() per field. last_synced is
+# usually absent, so it stays a separate .get().
+_COMMIT_DICT_KEYS = (
+    "repo_id",
+    "hash",
+    "message",
+    "author_name",
+    "author_email",
+    "author_when",
+    "committer_name",
+    "committer_email",
+    "committer_when",
+    "parents",
+)
+_COMMIT_DICT_GET = operator.itemgetter(*_COMMIT_DICT_KEYS)
+_BLAME_DICT_KEYS = (
+    "repo_id",
+    "path",
+    "line_no",
+    "author_email",
+    "author_name",
+    "author_when",
+    "commit_hash",
+    "line",
+)
+_BLAME_DICT_GET = operator.itemgetter(*_BLAME_DICT_KEYS)
+
+
+def _dict_values(
+    item: Dict[str, Any],
+    keys: Tuple[str, ...],
+    getter: Callable[[Dict[str, Any]], Tuple[Any, ...]],
+) -> Tuple[Any, ...]:
+    """Fetch ``keys`` from ``item`` in order, treating missing keys as None."""
+    try:
+        return getter(item)
+    except KeyError:
+        return tuple(map(item.get, keys))
+
+
+def _clickhouse_blame_rows(
+    data_batch: List[Any], synced_at_default: Optional[datetime]
+) -> List[_GitBlameRow]:
+    """Build ClickHouse git_blame rows."""
+    _normalize_uuid = ClickHouseStore._normalize_uuid
+    _normalize_datetime = ClickHouseStore._normalize_datetime
+    rows: List[_GitBlameRow] = []
+    for item in data_batch:
+        if isinstance(item, dict):
+            (
+                repo_id,
+                path,
+                line_no,
+                author_email,
+                author_name,
+                author_when,
+                commit_hash,
+                line,
+            ) = _dict_values(item, _BLAME_DICT_KEYS, _BLAME_DICT_GET)
+            rows.append(_GitBlameRow(
+                repo_id=_normalize_uuid(repo_id),
+                path=path,
+                line_no=int(line_no or 0),
+                author_email=author_email,
+                author_name=author_name,
+                author_when=_normalize_datetime(author_when),
+                commit_hash=commit_hash,
+                line=line,
+                last_synced=_normalize_datetime(
+                    item.get("last_synced") or synced_at_default
+                ),
+            ))
+        else:
+            rows.append(_GitBlameRow(
+                repo_id=_normalize_uuid(getattr(item, "repo_id")),
+                path=getattr(item, "path"),
+                line_no=int(getattr(item, "line_no") or 0),
+                author_email=getattr(item, "author_email"),
+                author_name=getattr(item, "author_name"),
+                author_when=_normalize_datetime(
+                    getattr(item, "author_when")
+                ),
+                commit_hash=getattr(item, "commit_hash"),
+                line=getattr(item, "line"),
+                last_synced=_normalize_datetime(
+                    getattr(item, "last_synced", None) or synced_at_default
+                ),
+            ))
+    return rows
 
 
 class ClickHouseStore:
@@ -1389,10 +1970,17 @@ class ClickHouseStore:
         self.conn_string = conn_string
         self.client = None
         self._lock = asyncio.Lock()
+        self._insert_buffer = _BufferedInserter(
+            {"git_blame": self._write_blame_data}, max_rows=INSERT_BUFFER_ROWS
+        )
+        # One timestamp per store session so every row written in a sync run
+        # shares the same last_synced default.
+        self._sync_started_at: Optional[datetime] = None
 
     async def __aenter__(self) -> "ClickHouseStore":
         import clickhouse_connect
 
+        self._sync_started_at = self._normalize_datetime(datetime.now(timezone.utc))
         self.client = await asyncio.to_thread(
             clickhouse_connect.get_client, dsn=self.conn_string
         )
@@ -1401,6 +1989,7 @@ class ClickHouseStore:
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         if self.client is not None:
+            await self._insert_buffer.flush_all()
             await asyncio.to_thread(self.client.close)
 
     @staticmethod
@@ -1409,6 +1998,8 @@ class ClickHouseStore:
             raise ValueError("UUID value is required")
         if isinstance(value, uuid.UUID):
             return value
+        if isinstance(value, str):
+            return uuid.UUID(value)
         return uuid.UUID(str(value))
 
     @staticmethod
@@ -1488,12 +2079,25 @@ class ClickHouseStore:
                 )
 
     async def _insert_rows(
-        self, table: str, columns: List[str], rows: List[Dict[str, Any]]
+        self,
+        table: str,
+        columns: List[str],
+        rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]],
     ) -> None:
+        """
+        Insert rows into a ClickHouse table.
+
+        Rows may be dicts keyed by column, or tuples already in ``columns``
+        order (e.g. the ``_Git*Row`` named tuples), which are passed through
+        to the driver as-is.
+        """
         if not rows:
             return
         assert self.client is not None
-        matrix = [[row.get(col) for col in columns] for row in rows]
+        matrix = [
+            [row.get(col) for col in columns] if isinstance(row, Mapping) else row
+            for row in rows
+        ]
         async with self._lock:
             await asyncio.to_thread(
                 self.client.insert, table, matrix, column_names=columns
@@ -1520,7 +2124,7 @@ class ClickHouseStore:
         if getattr(existing, "result_rows", None):
             return
 
-        synced_at = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at = self._sync_started_at
         created_at = (
             self._normalize_datetime(getattr(repo, "created_at", None)) or synced_at
         )
@@ -1717,209 +2321,169 @@ class ClickHouseStore:
         return await self._has_any("git_commit_stats", self._normalize_uuid(repo_id))
 
     async def has_any_git_blame(self, repo_id) -> bool:
+        await self._insert_buffer.flush("git_blame")
         return await self._has_any("git_blame", self._normalize_uuid(repo_id))
 
+    async def existence_snapshot(self, repo_id) -> Dict[str, bool]:
+        """Report which per-repo git tables already hold rows, in one query."""
+        assert self.client is not None
+        await self._insert_buffer.flush("git_blame")
+        tables = ("git_files", "git_commit_stats", "git_blame")
+        probes = ", ".join(
+            f"(SELECT count() FROM (SELECT 1 FROM {table} "
+            f"WHERE repo_id = {{repo_id:UUID}} LIMIT 1)) AS has_{table}"
+            for table in tables
+        )
+        async with self._lock:
+            result = await asyncio.to_thread(
+                self.client.query,
+                f"SELECT {probes}",
+                parameters={"repo_id": str(self._normalize_uuid(repo_id))},
+            )
+        rows = getattr(result, "result_rows", None) or [(0,) * len(tables)]
+        return {table: bool(value) for table, value in zip(tables, rows[0])}
+
     async def insert_git_file_data(self, file_data: List[GitFile]) -> None:
         if not file_data:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
-        rows: List[Dict[str, Any]] = []
+        synced_at_default = self._sync_started_at
+        rows: List[_GitFileRow] = []
+        # The `1 if ... else 0` ternary is measurably cheaper per row than
+        # int(bool(...)) or a (0, 1) lookup table; keep it for UInt8 columns.
         for item in file_data:
             if isinstance(item, dict):
-                rows.append({
-                    "repo_id": self._normalize_uuid(item.get("repo_id")),
-                    "path": item.get("path"),
-                    "executable": 1 if item.get("executable") else 0,
-                    "contents": item.get("contents"),
-                    "last_synced": self._normalize_datetime(
+                rows.append(_GitFileRow(
+                    repo_id=self._normalize_uuid(item.get("repo_id")),
+                    path=item.get("path"),
+                    executable=1 if item.get("executable") else 0,
+                    contents=item.get("contents"),
+                    last_synced=self._normalize_datetime(
                         item.get("last_synced") or synced_at_default
                     ),
-                })
+                ))
             else:
-                rows.append({
-                    "repo_id": self._normalize_uuid(getattr(item, "repo_id")),
-                    "path": getattr(item, "path"),
-                    "executable": 1 if getattr(item, "executable") else 0,
-                    "contents": getattr(item, "contents"),
-                    "last_synced": self._normalize_datetime(
+                rows.append(_GitFileRow(
+                    repo_id=self._normalize_uuid(getattr(item, "repo_id")),
+                    path=getattr(item, "path"),
+                    executable=1 if getattr(item, "executable") else 0,
+                    contents=getattr(item, "contents"),
+                    last_synced=self._normalize_datetime(
                         getattr(item, "last_synced", None) or synced_at_default
                     ),
-                })
+                ))
 
-        await self._insert_rows(
-            "git_files",
-            ["repo_id", "path", "executable", "contents", "last_synced"],
-            rows,
-        )
+        await self._insert_rows("git_files", list(_GitFileRow._fields), rows)
 
     async def insert_git_commit_data(self, commit_data: List[GitCommit]) -> None:
         if not commit_data:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
-        rows: List[Dict[str, Any]] = []
+        synced_at_default = self._sync_started_at
+        rows: List[_GitCommitRow] = []
         for item in commit_data:
             if isinstance(item, dict):
-                rows.append({
-                    "repo_id": self._normalize_uuid(item.get("repo_id")),
-                    "hash": item.get("hash"),
-                    "message": item.get("message"),
-                    "author_name": item.get("author_name"),
-                    "author_email": item.get("author_email"),
-                    "author_when": self._normalize_datetime(item.get("author_when")),
-                    "committer_name": item.get("committer_name"),
-                    "committer_email": item.get("committer_email"),
-                    "committer_when": self._normalize_datetime(
-                        item.get("committer_when")
-                    ),
-                    "parents": int(item.get("parents") or 0),
-                    "last_synced": self._normalize_datetime(
+                (
+                    repo_id,
+                    commit_hash,
+                    message,
+                    author_name,
+                    author_email,
+                    author_when,
+                    committer_name,
+                    committer_email,
+                    committer_when,
+                    parents,
+                ) = _dict_values(item, _COMMIT_DICT_KEYS, _COMMIT_DICT_GET)
+                rows.append(_GitCommitRow(
+                    repo_id=self._normalize_uuid(repo_id),
+                    hash=commit_hash,
+                    message=message,
+                    author_name=author_name,
+                    author_email=author_email,
+                    author_when=self._normalize_datetime(author_when),
+                    committer_name=committer_name,
+                    committer_email=committer_email,
+                    committer_when=self._normalize_datetime(committer_when),
+                    parents=int(parents or 0),
+                    last_synced=self._normalize_datetime(
                         item.get("last_synced") or synced_at_default
                     ),
-                })
+                ))
             else:
-                rows.append({
-                    "repo_id": self._normalize_uuid(getattr(item, "repo_id")),
-                    "hash": getattr(item, "hash"),
-                    "message": getattr(item, "message"),
-                    "author_name": getattr(item, "author_name"),
-                    "author_email": getattr(item, "author_email"),
-                    "author_when": self._normalize_datetime(
+                rows.append(_GitCommitRow(
+                    repo_id=self._normalize_uuid(getattr(item, "repo_id")),
+                    hash=getattr(item, "hash"),
+                    message=getattr(item, "message"),
+                    author_name=getattr(item, "author_name"),
+                    author_email=getattr(item, "author_email"),
+                    author_when=self._normalize_datetime(
                         getattr(item, "author_when")
                     ),
-                    "committer_name": getattr(item, "committer_name"),
-                    "committer_email": getattr(item, "committer_email"),
-                    "committer_when": self._normalize_datetime(
+                    committer_name=getattr(item, "committer_name"),
+                    committer_email=getattr(item, "committer_email"),
+                    committer_when=self._normalize_datetime(
                         getattr(item, "committer_when")
                     ),
-                    "parents": int(getattr(item, "parents") or 0),
-                    "last_synced": self._normalize_datetime(
+                    parents=int(getattr(item, "parents") or 0),
+                    last_synced=self._normalize_datetime(
                         getattr(item, "last_synced", None) or synced_at_default
                     ),
-                })
+                ))
 
-        await self._insert_rows(
-            "git_commits",
-            [
-                "repo_id",
-                "hash",
-                "message",
-                "author_name",
-                "author_email",
-                "author_when",
-                "committer_name",
-                "committer_email",
-                "committer_when",
-                "parents",
-                "last_synced",
-            ],
-            rows,
-        )
+        await self._insert_rows("git_commits", list(_GitCommitRow._fields), rows)
 
     async def insert_git_commit_stats(self, commit_stats: List[GitCommitStat]) -> None:
         if not commit_stats:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
-        rows: List[Dict[str, Any]] = []
+        synced_at_default = self._sync_started_at
+        rows: List[_GitCommitStatRow] = []
         for item in commit_stats:
             if isinstance(item, dict):
-                rows.append({
-                    "repo_id": self._normalize_uuid(item.get("repo_id")),
-                    "commit_hash": item.get("commit_hash"),
-                    "file_path": item.get("file_path"),
-                    "additions": int(item.get("additions") or 0),
-                    "deletions": int(item.get("deletions") or 0),
-                    "old_file_mode": item.get("old_file_mode") or "unknown",
-                    "new_file_mode": item.get("new_file_mode") or "unknown",
-                    "last_synced": self._normalize_datetime(
+                rows.append(_GitCommitStatRow(
+                    repo_id=self._normalize_uuid(item.get("repo_id")),
+                    commit_hash=item.get("commit_hash"),
+                    file_path=item.get("file_path"),
+                    additions=int(item.get("additions") or 0),
+                    deletions=int(item.get("deletions") or 0),
+                    old_file_mode=item.get("old_file_mode") or "unknown",
+                    new_file_mode=item.get("new_file_mode") or "unknown",
+                    last_synced=self._normalize_datetime(
                         item.get("last_synced") or synced_at_default
                     ),
-                })
+                ))
             else:
-                rows.append({
-                    "repo_id": self._normalize_uuid(getattr(item, "repo_id")),
-                    "commit_hash": getattr(item, "commit_hash"),
-                    "file_path": getattr(item, "file_path"),
-                    "additions": int(getattr(item, "additions") or 0),
-                    "deletions": int(getattr(item, "deletions") or 0),
-                    "old_file_mode": getattr(item, "old_file_mode", None) or "unknown",
-                    "new_file_mode": getattr(item, "new_file_mode", None) or "unknown",
-                    "last_synced": self._normalize_datetime(
+                rows.append(_GitCommitStatRow(
+                    repo_id=self._normalize_uuid(getattr(item, "repo_id")),
+                    commit_hash=getattr(item, "commit_hash"),
+                    file_path=getattr(item, "file_path"),
+                    additions=int(getattr(item, "additions") or 0),
+                    deletions=int(getattr(item, "deletions") or 0),
+                    old_file_mode=getattr(item, "old_file_mode", None) or "unknown",
+                    new_file_mode=getattr(item, "new_file_mode", None) or "unknown",
+                    last_synced=self._normalize_datetime(
                         getattr(item, "last_synced", None) or synced_at_default
                     ),
-                })
+                ))
 
         await self._insert_rows(
-            "git_commit_stats",
-            [
-                "repo_id",
-                "commit_hash",
-                "file_path",
-                "additions",
-                "deletions",
-                "old_file_mode",
-                "new_file_mode",
-                "last_synced",
-            ],
-            rows,
+            "git_commit_stats", list(_GitCommitStatRow._fields), rows
         )
 
     async def insert_blame_data(self, data_batch: List[GitBlame]) -> None:
         if not data_batch:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
-        rows: List[Dict[str, Any]] = []
-        for item in data_batch:
-            if isinstance(item, dict):
-                rows.append({
-                    "repo_id": self._normalize_uuid(item.get("repo_id")),
-                    "path": item.get("path"),
-                    "line_no": int(item.get("line_no") or 0),
-                    "author_email": item.get("author_email"),
-                    "author_name": item.get("author_name"),
-                    "author_when": self._normalize_datetime(item.get("author_when")),
-                    "commit_hash": item.get("commit_hash"),
-                    "line": item.get("line"),
-                    "last_synced": self._normalize_datetime(
-                        item.get("last_synced") or synced_at_default
-                    ),
-                })
-            else:
-                rows.append({
-                    "repo_id": self._normalize_uuid(getattr(item, "repo_id")),
-                    "path": getattr(item, "path"),
-                    "line_no": int(getattr(item, "line_no") or 0),
-                    "author_email": getattr(item, "author_email"),
-                    "author_name": getattr(item, "author_name"),
-                    "author_when": self._normalize_datetime(
-                        getattr(item, "author_when")
-                    ),
-                    "commit_hash": getattr(item, "commit_hash"),
-                    "line": getattr(item, "line"),
-                    "last_synced": self._normalize_datetime(
-                        getattr(item, "last_synced", None) or synced_at_default
-                    ),
-                })
+        self._insert_buffer.extend("git_blame", data_batch)
+        await self._insert_buffer.maybe_flush()
 
-        await self._insert_rows(
-            "git_blame",
-            [
-                "repo_id",
-                "path",
-                "line_no",
-                "author_email",
-                "author_name",
-                "author_when",
-                "commit_hash",
-                "line",
-                "last_synced",
-            ],
-            rows,
-        )
+    async def _write_blame_data(self, data_batch: List[GitBlame]) -> None:
+        synced_at_default = self._sync_started_at
+        rows = _clickhouse_blame_rows(data_batch, synced_at_default)
+
+        await self._insert_rows("git_blame", list(_GitBlameRow._fields), rows)
 
     async def insert_git_pull_requests(self, pr_data: List[GitPullRequest]) -> None:
         if not pr_data:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in pr_data:
             if isinstance(item, dict):
@@ -2017,7 +2581,7 @@ class ClickHouseStore:
     ) -> None:
         if not review_data:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in review_data:
             if isinstance(item, dict):
@@ -2064,7 +2628,7 @@ class ClickHouseStore:
     async def insert_ci_pipeline_runs(self, runs: List[CiPipelineRun]) -> None:
         if not runs:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in runs:
             if isinstance(item, dict):
@@ -2115,7 +2679,7 @@ class ClickHouseStore:
     async def insert_deployments(self, deployments: List[Deployment]) -> None:
         if not deployments:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in deployments:
             if isinstance(item, dict):
@@ -2179,7 +2743,7 @@ class ClickHouseStore:
     async def insert_incidents(self, incidents: List[Incident]) -> None:
         if not incidents:
             return
-        synced_at_default = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at_default = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in incidents:
             if isinstance(item, dict):
@@ -2228,7 +2792,7 @@ class ClickHouseStore:
         # Note: Imports inside method to avoid circular deps if models imports storage
         from models.teams import Team
         
-        synced_at = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         for item in teams:
             if isinstance(item, dict):
@@ -2282,7 +2846,7 @@ class ClickHouseStore:
         if not work_items:
             return
         
-        synced_at = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at = self._sync_started_at
         rows: List[Dict[str, Any]] = []
         
         for item in work_items:
@@ -2342,7 +2906,7 @@ class ClickHouseStore:
         if not transitions:
             return
             
-        synced_at = self._normalize_datetime(datetime.now(timezone.utc))
+        synced_at = self._sync_started_at
         rows: List[Dict[str, Any]] = []
 
         for item in transitions:
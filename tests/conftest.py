@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pytest
 from git import Repo as GitRepo
+from sqlalchemy import event
 
 
 @pytest.fixture
@@ -33,6 +34,36 @@ def test_file(repo_path):
     return os.path.join(repo_path, "README.md")
 
 
+@pytest.fixture
+def query_counter():
+    """
+    Record the SQL statements an engine sends, to catch N+1 regressions.
+
+    Call ``query_counter(engine)`` (sync or async engine) to start recording;
+    it returns a list that grows with each statement executed. An
+    executemany batch counts as one statement.
+    """
+    listeners = []
+
+    def _attach(engine):
+        statements = []
+        target = getattr(engine, "sync_engine", engine)
+
+        def _before_cursor_execute(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            statements.append(statement)
+
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        listeners.append((target, _before_cursor_execute))
+        return statements
+
+    yield _attach
+
+    for target, fn in listeners:
+        event.remove(target, "before_cursor_execute", fn)
+
+
 def pytest_configure(config):
     # Ensure TypeScript files are treated as text, not video/mp2t.
     mimetypes.add_type("text/x-typescript", ".ts")
@@ -2,14 +2,82 @@
 Tests for batch repository processing features.
 """
 
+import itertools
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import pytest
 
-from connectors import GitHubConnector, BatchResult, match_repo_pattern
+from connectors import GitHubConnector, BatchResult, compile_pattern, match_repo_pattern
 from models.git import GitCommit, GitCommitStat, get_repo_uuid_from_repo
 
+# Deterministic ids for mock repos/projects (hash() is salted per process).
+_mock_ids = itertools.count(1)
+
+
+@pytest.fixture
+def mock_github_client():
+    """Create a mock GitHub client."""
+    with patch("connectors.github.Github") as mock_github:
+        yield mock_github
+
+
+@pytest.fixture
+def mock_graphql_client():
+    """Create a mock GraphQL client."""
+    with patch("connectors.github.GitHubGraphQLClient") as mock_graphql:
+        yield mock_graphql
+
+
+@pytest.fixture
+def mock_gitlab_client():
+    """Create a mock GitLab client."""
+    with patch("connectors.gitlab.gitlab.Gitlab") as mock_gitlab:
+        mock_instance = mock_gitlab.return_value
+        mock_instance.auth.return_value = None
+        yield mock_gitlab
+
+
+@pytest.fixture
+def mock_rest_client():
+    """Create a mock REST client."""
+    with patch("connectors.gitlab.GitLabRESTClient") as mock_rest:
+        yield mock_rest
+
+
+def _create_mock_repo(name: str, full_name: str):
+    """Create a mock repository."""
+    return SimpleNamespace(
+        id=next(_mock_ids),
+        name=name,
+        full_name=full_name,
+        default_branch="main",
+        description=f"Test repository {name}",
+        html_url=f"https://github.com/{full_name}",
+        created_at=None,
+        updated_at=None,
+        language="Python",
+        stargazers_count=10,
+        forks_count=5,
+    )
+
+
+def _create_mock_project(name: str, full_name: str):
+    """Create a mock project."""
+    return SimpleNamespace(
+        id=next(_mock_ids),
+        name=name,
+        path_with_namespace=full_name,
+        default_branch="main",
+        description=f"Test project {name}",
+        web_url=f"https://gitlab.com/{full_name}",
+        created_at="2024-01-01T00:00:00Z",
+        last_activity_at="2024-01-01T00:00:00Z",
+        star_count=10,
+        forks_count=5,
+    )
+
 
 @pytest.mark.asyncio
 async def test_github_async_batch_callback_fires_as_completed(monkeypatch):
@@ -70,6 +138,60 @@ async def test_github_async_batch_callback_fires_as_completed(monkeypatch):
     assert callback_order[1] == "slow"
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_async", [True, False], ids=["async", "sync"])
+async def test_github_batches_do_not_wait_for_slow_repo(monkeypatch, use_async):
+    """A slow repo should not hold back repos queued in later batches."""
+    import time
+    from unittest.mock import patch
+
+    from connectors.models import Repository
+
+    with (
+        patch("connectors.github.Github"),
+        patch("connectors.github.GitHubGraphQLClient"),
+    ):
+        connector = GitHubConnector(token="test_token")
+
+    repos = [
+        Repository(
+            id=i,
+            name=name,
+            full_name=f"org/{name}",
+            default_branch="main",
+            url=f"https://example.com/org/{name}",
+        )
+        for i, name in enumerate(["slow", "fast1", "fast2"])
+    ]
+    monkeypatch.setattr(
+        connector,
+        "_get_repositories_for_processing",
+        lambda **kwargs: repos,
+    )
+
+    def fake_process(repo, max_commits):
+        time.sleep(0.2 if repo.name == "slow" else 0.01)
+        return BatchResult(repository=repo, stats=None, success=True)
+
+    monkeypatch.setattr(connector, "_process_single_repo_stats", fake_process)
+
+    callback_order = []
+    kwargs = dict(
+        org_name="org",
+        batch_size=1,
+        max_concurrent=2,
+        rate_limit_delay=0,
+        on_repo_complete=lambda r: callback_order.append(r.repository.name),
+    )
+
+    if use_async:
+        await connector.get_repos_with_stats_async(**kwargs)
+    else:
+        connector.get_repos_with_stats(**kwargs)
+
+    assert callback_order == ["fast1", "fast2", "slow"]
+
+
 @pytest.mark.asyncio
 async def test_gitlab_async_batch_callback_fires_as_completed(monkeypatch):
     """Fast projects should invoke callback before slow projects in same batch."""
@@ -592,6 +714,12 @@ class TestPatternMatching:
         assert not match_repo_pattern("chrisgeo/repo", "other/*")
         assert not match_repo_pattern("org/api", "org/web*")
 
+    def test_compiled_pattern_matches_like_match_repo_pattern(self):
+        """Test that a compiled matcher agrees with match_repo_pattern."""
+        matcher = compile_pattern("ChrisGeo/api-v?")
+        for name in ("chrisgeo/api-v1", "CHRISGEO/API-V2", "chrisgeo/api-v10", "org/api-v1"):
+            assert matcher(name) == match_repo_pattern(name, "ChrisGeo/api-v?")
+
 
 class TestBatchResult:
     """Test BatchResult dataclass."""
@@ -629,44 +757,16 @@ class TestBatchResult:
 class TestGitHubConnectorBatchProcessing:
     """Test GitHub connector batch processing features."""
 
-    @pytest.fixture
-    def mock_github_client(self):
-        """Create a mock GitHub client."""
-        with patch("connectors.github.Github") as mock_github:
-            yield mock_github
-
-    @pytest.fixture
-    def mock_graphql_client(self):
-        """Create a mock GraphQL client."""
-        with patch("connectors.github.GitHubGraphQLClient") as mock_graphql:
-            yield mock_graphql
-
-    def _create_mock_repo(self, name: str, full_name: str):
-        """Create a mock repository."""
-        mock_repo = Mock()
-        mock_repo.id = hash(full_name)
-        mock_repo.name = name
-        mock_repo.full_name = full_name
-        mock_repo.default_branch = "main"
-        mock_repo.description = f"Test repository {name}"
-        mock_repo.html_url = f"https://github.com/{full_name}"
-        mock_repo.created_at = None
-        mock_repo.updated_at = None
-        mock_repo.language = "Python"
-        mock_repo.stargazers_count = 10
-        mock_repo.forks_count = 5
-        return mock_repo
-
     def test_list_repositories_with_pattern(
         self, mock_github_client, mock_graphql_client
     ):
         """Test listing repositories with pattern matching."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("mergestat-syncs", "chrisgeo/mergestat-syncs"),
-            self._create_mock_repo("mergestat-lite", "chrisgeo/mergestat-lite"),
-            self._create_mock_repo("other-repo", "chrisgeo/other-repo"),
-            self._create_mock_repo("api-service", "chrisgeo/api-service"),
+            _create_mock_repo("mergestat-syncs", "chrisgeo/mergestat-syncs"),
+            _create_mock_repo("mergestat-lite", "chrisgeo/mergestat-lite"),
+            _create_mock_repo("other-repo", "chrisgeo/other-repo"),
+            _create_mock_repo("api-service", "chrisgeo/api-service"),
         ]
 
         mock_user = Mock()
@@ -683,8 +783,10 @@ class TestGitHubConnectorBatchProcessing:
         )
 
         # Should only return repos matching the pattern
-        assert len(repos) == 2
-        assert all("merge" in repo.full_name.lower() for repo in repos)
+        assert sorted(repo.full_name for repo in repos) == [
+            "chrisgeo/mergestat-lite",
+            "chrisgeo/mergestat-syncs",
+        ]
 
     def test_list_repositories_with_pattern_max_repos(
         self, mock_github_client, mock_graphql_client
@@ -692,7 +794,7 @@ class TestGitHubConnectorBatchProcessing:
         """Test list_repositories with pattern respects max_repos."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo(f"mergestat-{i}", f"chrisgeo/mergestat-{i}")
+            _create_mock_repo(f"mergestat-{i}", f"chrisgeo/mergestat-{i}")
             for i in range(10)
         ]
 
@@ -712,12 +814,38 @@ class TestGitHubConnectorBatchProcessing:
 
         assert len(repos) == 3
 
+    def test_list_repositories_stops_consuming_at_max_repos(
+        self, mock_github_client, mock_graphql_client
+    ):
+        """Test list_repositories does not pull repos past max_repos."""
+        mock_repos = [
+            _create_mock_repo(f"repo{i}", f"chrisgeo/repo{i}") for i in range(10)
+        ]
+        consumed = []
+
+        def iter_repos():
+            for repo in mock_repos:
+                consumed.append(repo)
+                yield repo
+
+        mock_user = Mock()
+        mock_user.get_repos.return_value = iter_repos()
+
+        mock_github_instance = mock_github_client.return_value
+        mock_github_instance.get_user.return_value = mock_user
+
+        connector = GitHubConnector(token="test_token")
+        repos = connector.list_repositories(user_name="chrisgeo", max_repos=3)
+
+        assert len(repos) == 3
+        assert len(consumed) == 3
+
     def test_get_repos_with_stats_sync(self, mock_github_client, mock_graphql_client):
         """Test synchronous batch processing of repositories with stats."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "chrisgeo/repo1"),
-            self._create_mock_repo("repo2", "chrisgeo/repo2"),
+            _create_mock_repo("repo1", "chrisgeo/repo1"),
+            _create_mock_repo("repo2", "chrisgeo/repo2"),
         ]
 
         mock_user = Mock()
@@ -750,9 +878,9 @@ class TestGitHubConnectorBatchProcessing:
         """Test batch processing with pattern filtering."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("api-v1", "org/api-v1"),
-            self._create_mock_repo("api-v2", "org/api-v2"),
-            self._create_mock_repo("web-app", "org/web-app"),
+            _create_mock_repo("api-v1", "org/api-v1"),
+            _create_mock_repo("api-v2", "org/api-v2"),
+            _create_mock_repo("web-app", "org/web-app"),
         ]
 
         mock_org = Mock()
@@ -777,8 +905,7 @@ class TestGitHubConnectorBatchProcessing:
         )
 
         # Should only process repos matching pattern
-        assert len(results) == 2
-        assert all("api-" in r.repository.full_name for r in results)
+        assert sorted(r.repository.full_name for r in results) == ["org/api-v1", "org/api-v2"]
 
     def test_get_repos_with_stats_callback(
         self, mock_github_client, mock_graphql_client
@@ -786,8 +913,8 @@ class TestGitHubConnectorBatchProcessing:
         """Test callback is called for each processed repository."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "user/repo1"),
-            self._create_mock_repo("repo2", "user/repo2"),
+            _create_mock_repo("repo1", "user/repo1"),
+            _create_mock_repo("repo2", "user/repo2"),
         ]
 
         mock_user = Mock()
@@ -818,34 +945,6 @@ class TestGitHubConnectorBatchProcessing:
 class TestGitHubConnectorAsyncBatchProcessing:
     """Test GitHub connector async batch processing features."""
 
-    @pytest.fixture
-    def mock_github_client(self):
-        """Create a mock GitHub client."""
-        with patch("connectors.github.Github") as mock_github:
-            yield mock_github
-
-    @pytest.fixture
-    def mock_graphql_client(self):
-        """Create a mock GraphQL client."""
-        with patch("connectors.github.GitHubGraphQLClient") as mock_graphql:
-            yield mock_graphql
-
-    def _create_mock_repo(self, name: str, full_name: str):
-        """Create a mock repository."""
-        mock_repo = Mock()
-        mock_repo.id = hash(full_name)
-        mock_repo.name = name
-        mock_repo.full_name = full_name
-        mock_repo.default_branch = "main"
-        mock_repo.description = f"Test repository {name}"
-        mock_repo.html_url = f"https://github.com/{full_name}"
-        mock_repo.created_at = None
-        mock_repo.updated_at = None
-        mock_repo.language = "Python"
-        mock_repo.stargazers_count = 10
-        mock_repo.forks_count = 5
-        return mock_repo
-
     @pytest.mark.asyncio
     async def test_get_repos_with_stats_async(
         self, mock_github_client, mock_graphql_client
@@ -853,8 +952,8 @@ class TestGitHubConnectorAsyncBatchProcessing:
         """Test async batch processing of repositories with stats."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "chrisgeo/repo1"),
-            self._create_mock_repo("repo2", "chrisgeo/repo2"),
+            _create_mock_repo("repo1", "chrisgeo/repo1"),
+            _create_mock_repo("repo2", "chrisgeo/repo2"),
         ]
 
         mock_user = Mock()
@@ -888,9 +987,9 @@ class TestGitHubConnectorAsyncBatchProcessing:
         """Test async batch processing with pattern filtering."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("api-v1", "org/api-v1"),
-            self._create_mock_repo("api-v2", "org/api-v2"),
-            self._create_mock_repo("web-app", "org/web-app"),
+            _create_mock_repo("api-v1", "org/api-v1"),
+            _create_mock_repo("api-v2", "org/api-v2"),
+            _create_mock_repo("web-app", "org/web-app"),
         ]
 
         mock_org = Mock()
@@ -915,8 +1014,7 @@ class TestGitHubConnectorAsyncBatchProcessing:
         )
 
         # Should only process repos matching pattern
-        assert len(results) == 2
-        assert all("api-" in r.repository.full_name for r in results)
+        assert sorted(r.repository.full_name for r in results) == ["org/api-v1", "org/api-v2"]
 
     @pytest.mark.asyncio
     async def test_get_repos_with_stats_async_callback(
@@ -925,8 +1023,8 @@ class TestGitHubConnectorAsyncBatchProcessing:
         """Test async callback is called for each processed repository."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "user/repo1"),
-            self._create_mock_repo("repo2", "user/repo2"),
+            _create_mock_repo("repo1", "user/repo1"),
+            _create_mock_repo("repo2", "user/repo2"),
         ]
 
         mock_user = Mock()
@@ -957,42 +1055,14 @@ class TestGitHubConnectorAsyncBatchProcessing:
 class TestBatchProcessingErrorHandling:
     """Test error handling in batch repository processing."""
 
-    @pytest.fixture
-    def mock_github_client(self):
-        """Create a mock GitHub client."""
-        with patch("connectors.github.Github") as mock_github:
-            yield mock_github
-
-    @pytest.fixture
-    def mock_graphql_client(self):
-        """Create a mock GraphQL client."""
-        with patch("connectors.github.GitHubGraphQLClient") as mock_graphql:
-            yield mock_graphql
-
-    def _create_mock_repo(self, name: str, full_name: str):
-        """Create a mock repository."""
-        mock_repo = Mock()
-        mock_repo.id = hash(full_name)
-        mock_repo.name = name
-        mock_repo.full_name = full_name
-        mock_repo.default_branch = "main"
-        mock_repo.description = f"Test repository {name}"
-        mock_repo.html_url = f"https://github.com/{full_name}"
-        mock_repo.created_at = None
-        mock_repo.updated_at = None
-        mock_repo.language = "Python"
-        mock_repo.stargazers_count = 10
-        mock_repo.forks_count = 5
-        return mock_repo
-
     def test_batch_processing_handles_api_error(
         self, mock_github_client, mock_graphql_client
     ):
         """Test batch processing continues when get_repo_stats raises an exception."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "user/repo1"),
-            self._create_mock_repo("repo2", "user/repo2"),
+            _create_mock_repo("repo1", "user/repo1"),
+            _create_mock_repo("repo2", "user/repo2"),
         ]
 
         mock_user = Mock()
@@ -1027,9 +1097,9 @@ class TestBatchProcessingErrorHandling:
 
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "user/repo1"),
-            self._create_mock_repo("repo2", "user/repo2"),
-            self._create_mock_repo("repo3", "user/repo3"),
+            _create_mock_repo("repo1", "user/repo1"),
+            _create_mock_repo("repo2", "user/repo2"),
+            _create_mock_repo("repo3", "user/repo3"),
         ]
 
         mock_user = Mock()
@@ -1118,8 +1188,8 @@ class TestBatchProcessingErrorHandling:
         """Test async batch processing continues when get_repo_stats raises an exception."""
         # Setup mock repos
         mock_repos = [
-            self._create_mock_repo("repo1", "user/repo1"),
-            self._create_mock_repo("repo2", "user/repo2"),
+            _create_mock_repo("repo1", "user/repo1"),
+            _create_mock_repo("repo2", "user/repo2"),
         ]
 
         mock_user = Mock()
@@ -1232,45 +1302,16 @@ class TestGitLabBatchResult:
 class TestGitLabConnectorBatchProcessing:
     """Test GitLab connector batch processing features."""
 
-    @pytest.fixture
-    def mock_gitlab_client(self):
-        """Create a mock GitLab client."""
-        with patch("connectors.gitlab.gitlab.Gitlab") as mock_gitlab:
-            mock_instance = mock_gitlab.return_value
-            mock_instance.auth.return_value = None
-            yield mock_gitlab
-
-    @pytest.fixture
-    def mock_rest_client(self):
-        """Create a mock REST client."""
-        with patch("connectors.gitlab.GitLabRESTClient") as mock_rest:
-            yield mock_rest
-
-    def _create_mock_project(self, name: str, full_name: str):
-        """Create a mock project."""
-        mock_project = Mock()
-        mock_project.id = hash(full_name)
-        mock_project.name = name
-        mock_project.path_with_namespace = full_name
-        mock_project.default_branch = "main"
-        mock_project.description = f"Test project {name}"
-        mock_project.web_url = f"https://gitlab.com/{full_name}"
-        mock_project.created_at = "2024-01-01T00:00:00Z"
-        mock_project.last_activity_at = "2024-01-01T00:00:00Z"
-        mock_project.star_count = 10
-        mock_project.forks_count = 5
-        return mock_project
-
     def test_list_projects_with_pattern(self, mock_gitlab_client, mock_rest_client):
         """Test listing projects with pattern matching."""
         from connectors import GitLabConnector
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("api-service", "group/api-service"),
-            self._create_mock_project("api-v2", "group/api-v2"),
-            self._create_mock_project("web-app", "group/web-app"),
-            self._create_mock_project("cli-tool", "group/cli-tool"),
+            _create_mock_project("api-service", "group/api-service"),
+            _create_mock_project("api-v2", "group/api-v2"),
+            _create_mock_project("web-app", "group/web-app"),
+            _create_mock_project("cli-tool", "group/cli-tool"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1283,8 +1324,10 @@ class TestGitLabConnectorBatchProcessing:
         projects = connector.list_projects(pattern="group/api-*")
 
         # Should only return projects matching the pattern
-        assert len(projects) == 2
-        assert all("api" in proj.full_name.lower() for proj in projects)
+        assert sorted(proj.full_name for proj in projects) == [
+            "group/api-service",
+            "group/api-v2",
+        ]
 
     def test_get_projects_with_stats_sync(self, mock_gitlab_client, mock_rest_client):
         """Test synchronous batch processing of projects with stats."""
@@ -1292,8 +1335,8 @@ class TestGitLabConnectorBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1326,9 +1369,9 @@ class TestGitLabConnectorBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("api-v1", "org/api-v1"),
-            self._create_mock_project("api-v2", "org/api-v2"),
-            self._create_mock_project("web-app", "org/web-app"),
+            _create_mock_project("api-v1", "org/api-v1"),
+            _create_mock_project("api-v2", "org/api-v2"),
+            _create_mock_project("web-app", "org/web-app"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1356,8 +1399,7 @@ class TestGitLabConnectorBatchProcessing:
         )
 
         # Should only process projects matching pattern
-        assert len(results) == 2
-        assert all("api-" in r.project.full_name for r in results)
+        assert sorted(r.project.full_name for r in results) == ["org/api-v1", "org/api-v2"]
 
     def test_get_projects_with_stats_callback(
         self, mock_gitlab_client, mock_rest_client
@@ -1367,8 +1409,8 @@ class TestGitLabConnectorBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1397,35 +1439,6 @@ class TestGitLabConnectorBatchProcessing:
 class TestGitLabConnectorAsyncBatchProcessing:
     """Test GitLab connector async batch processing features."""
 
-    @pytest.fixture
-    def mock_gitlab_client(self):
-        """Create a mock GitLab client."""
-        with patch("connectors.gitlab.gitlab.Gitlab") as mock_gitlab:
-            mock_instance = mock_gitlab.return_value
-            mock_instance.auth.return_value = None
-            yield mock_gitlab
-
-    @pytest.fixture
-    def mock_rest_client(self):
-        """Create a mock REST client."""
-        with patch("connectors.gitlab.GitLabRESTClient") as mock_rest:
-            yield mock_rest
-
-    def _create_mock_project(self, name: str, full_name: str):
-        """Create a mock project."""
-        mock_project = Mock()
-        mock_project.id = hash(full_name)
-        mock_project.name = name
-        mock_project.path_with_namespace = full_name
-        mock_project.default_branch = "main"
-        mock_project.description = f"Test project {name}"
-        mock_project.web_url = f"https://gitlab.com/{full_name}"
-        mock_project.created_at = "2024-01-01T00:00:00Z"
-        mock_project.last_activity_at = "2024-01-01T00:00:00Z"
-        mock_project.star_count = 10
-        mock_project.forks_count = 5
-        return mock_project
-
     @pytest.mark.asyncio
     async def test_get_projects_with_stats_async(
         self, mock_gitlab_client, mock_rest_client
@@ -1435,8 +1448,8 @@ class TestGitLabConnectorAsyncBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1470,9 +1483,9 @@ class TestGitLabConnectorAsyncBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("api-v1", "org/api-v1"),
-            self._create_mock_project("api-v2", "org/api-v2"),
-            self._create_mock_project("web-app", "org/web-app"),
+            _create_mock_project("api-v1", "org/api-v1"),
+            _create_mock_project("api-v2", "org/api-v2"),
+            _create_mock_project("web-app", "org/web-app"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1500,8 +1513,7 @@ class TestGitLabConnectorAsyncBatchProcessing:
         )
 
         # Should only process projects matching pattern
-        assert len(results) == 2
-        assert all("api-" in r.project.full_name for r in results)
+        assert sorted(r.project.full_name for r in results) == ["org/api-v1", "org/api-v2"]
 
     @pytest.mark.asyncio
     async def test_get_projects_with_stats_async_callback(
@@ -1512,8 +1524,8 @@ class TestGitLabConnectorAsyncBatchProcessing:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1542,35 +1554,6 @@ class TestGitLabConnectorAsyncBatchProcessing:
 class TestGitLabBatchProcessingErrorHandling:
     """Test error handling in GitLab batch project processing."""
 
-    @pytest.fixture
-    def mock_gitlab_client(self):
-        """Create a mock GitLab client."""
-        with patch("connectors.gitlab.gitlab.Gitlab") as mock_gitlab:
-            mock_instance = mock_gitlab.return_value
-            mock_instance.auth.return_value = None
-            yield mock_gitlab
-
-    @pytest.fixture
-    def mock_rest_client(self):
-        """Create a mock REST client."""
-        with patch("connectors.gitlab.GitLabRESTClient") as mock_rest:
-            yield mock_rest
-
-    def _create_mock_project(self, name: str, full_name: str):
-        """Create a mock project."""
-        mock_project = Mock()
-        mock_project.id = hash(full_name)
-        mock_project.name = name
-        mock_project.path_with_namespace = full_name
-        mock_project.default_branch = "main"
-        mock_project.description = f"Test project {name}"
-        mock_project.web_url = f"https://gitlab.com/{full_name}"
-        mock_project.created_at = "2024-01-01T00:00:00Z"
-        mock_project.last_activity_at = "2024-01-01T00:00:00Z"
-        mock_project.star_count = 10
-        mock_project.forks_count = 5
-        return mock_project
-
     def test_batch_processing_handles_api_error(
         self, mock_gitlab_client, mock_rest_client
     ):
@@ -1579,8 +1562,8 @@ class TestGitLabBatchProcessingErrorHandling:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1614,9 +1597,9 @@ class TestGitLabBatchProcessingErrorHandling:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
-            self._create_mock_project("project3", "group/project3"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
+            _create_mock_project("project3", "group/project3"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -1667,8 +1650,8 @@ class TestGitLabBatchProcessingErrorHandling:
 
         # Setup mock projects
         mock_projects = [
-            self._create_mock_project("project1", "group/project1"),
-            self._create_mock_project("project2", "group/project2"),
+            _create_mock_project("project1", "group/project1"),
+            _create_mock_project("project2", "group/project2"),
         ]
 
         mock_gitlab_instance = mock_gitlab_client.return_value
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from providers.identity import IdentityResolver
+
+
+def test_resolve_memoizes_per_resolver() -> None:
+    identity = IdentityResolver(
+        alias_to_canonical={"jira:accountid:abc": "dev@example.com"}
+    )
+
+    first = identity.resolve(provider="jira", account_id="abc", display_name="Dev")
+    second = identity.resolve(provider="jira", account_id="abc", display_name="Dev")
+
+    assert first == second == "dev@example.com"
+    assert len(identity._resolved) == 1
+    assert identity.resolve(provider="jira", display_name=" Other ") == "Other"
+    assert len(identity._resolved) == 2
+
+
+def test_resolvers_with_same_aliases_compare_equal() -> None:
+    a = IdentityResolver(alias_to_canonical={"x": "y"})
+    b = IdentityResolver(alias_to_canonical={"x": "y"})
+    a.resolve(provider="jira", username="x")
+
+    assert a == b
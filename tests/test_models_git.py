@@ -4,6 +4,8 @@ import uuid
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from models.git import (
     GitBlame,
     GitCommit,
@@ -13,9 +15,18 @@ from models.git import (
     Repo,
     get_repo_uuid,
     get_repo_uuid_from_repo,
+    _repo_uuid_from_git,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_repo_uuid_cache():
+    """Keep UUIDs derived from mocked repos out of other tests."""
+    _repo_uuid_from_git.cache_clear()
+    yield
+    _repo_uuid_from_git.cache_clear()
+
+
 class TestRepoUUID:
     """Test that Repo objects get deterministic UUIDs based on git data."""
 
@@ -81,6 +92,17 @@ class TestRepoUUID:
 
             assert isinstance(result, uuid.UUID)
 
+    def test_repo_uuid_is_cached_per_absolute_path(self):
+        """Test that the git config is read once per repository path."""
+        with patch("models.git.GitRepo") as MockGitRepo:
+            MockGitRepo.return_value.remotes = []
+
+            first = get_repo_uuid("/path/to/repo")
+            second = get_repo_uuid("/path/to/../to/repo")
+
+            assert first == second
+            MockGitRepo.assert_called_once_with("/path/to/repo")
+
     def test_repo_id_is_set_on_init(self):
         """Test that Repo.id is automatically set when initialized with a path."""
         with (
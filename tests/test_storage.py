@@ -1,10 +1,13 @@
 import uuid
 from datetime import date, datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
+from bson.raw_bson import RawBSONDocument
 from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 from sqlalchemy import select, text
 
 from models import GitBlame, GitCommit, GitCommitStat, GitFile, Repo
@@ -13,6 +16,7 @@ from storage import (
     ClickHouseStore,
     MongoStore,
     SQLAlchemyStore,
+    close_all_engines,
     create_store,
     detect_db_type,
     model_to_dict,
@@ -69,6 +73,18 @@ class TestDetectDbType:
         with pytest.raises(ValueError, match="Could not detect database type"):
             detect_db_type("unknown://localhost/mydb")
 
+    def test_detect_reports_scheme_in_error(self):
+        """Test that the error names the unrecognised scheme."""
+        with pytest.raises(ValueError, match="Got scheme: 'mysql\\+aiomysql'"):
+            detect_db_type("mysql+aiomysql://localhost/mydb")
+        with pytest.raises(ValueError, match="Got scheme: 'unknown'"):
+            detect_db_type("localhost:5432/mydb")
+
+    def test_detect_ignores_long_query_string(self):
+        """Test that only the scheme decides the type."""
+        url = "postgresql+asyncpg://localhost/mydb?" + "application_name=X&" * 10_000
+        assert detect_db_type(url) == "postgres"
+
 
 class TestCreateStore:
     """Tests for the create_store factory function."""
@@ -125,6 +141,18 @@ def test_model_to_dict_serializes_uuid_and_fields(repo_uuid):
     assert doc["commit_hash"] == "abc123"
 
 
+def test_model_to_dict_uses_column_keys_and_keeps_unset_guid():
+    repo = Repo(repo="https://github.com/test/repo.git", repo_tags=["a"])
+    repo.id = None
+
+    doc = model_to_dict(repo)
+
+    assert doc["id"] is None
+    assert doc["repo"] == "https://github.com/test/repo.git"
+    assert doc["repo_tags"] == ["a"]
+    assert "tags" not in doc
+
+
 @pytest.fixture
 def test_db_url():
     """Return a SQLite in-memory database URL for testing."""
@@ -217,6 +245,23 @@ async def test_sqlalchemy_store_insert_repo_duplicate(sqlalchemy_store):
         assert len(repos) == 1
 
 
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_insert_repo_applies_column_defaults(sqlalchemy_store):
+    """Test that unset repo columns fall back to their defaults on insert."""
+    test_repo = Repo(repo="https://github.com/test/defaults.git", tags=["x"])
+
+    async with sqlalchemy_store as store:
+        await store.insert_repo(test_repo)
+
+        saved_repo = (
+            await store.session.execute(select(Repo).where(Repo.id == test_repo.id))
+        ).scalar_one()
+
+        assert saved_repo.created_at is not None
+        assert saved_repo.settings == {}
+        assert saved_repo.repo_tags == ["x"]
+
+
 @pytest.mark.asyncio
 async def test_sqlalchemy_store_get_complexity_snapshots_latest_for_repo(sqlalchemy_store):
     repo_id = uuid.uuid4()
@@ -669,6 +714,318 @@ async def test_sqlalchemy_store_insert_blame_data_empty_list(sqlalchemy_store):
         # Should not raise any error
 
 
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_insert_blame_data_buffered(sqlalchemy_store):
+    """Test that small blame batches are coalesced until the buffer flushes."""
+    test_repo_id = uuid.uuid4()
+
+    def _blame(line_no):
+        return GitBlame(
+            repo_id=test_repo_id,
+            path="file.txt",
+            line_no=line_no,
+            author_email="author@example.com",
+            author_name="Test Author",
+            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            commit_hash="abc123",
+            line=f"line {line_no} content",
+        )
+
+    sqlalchemy_store._insert_buffer.max_rows = 3
+    sqlalchemy_store._insert_buffer.max_delay_ms = 60_000
+
+    async with sqlalchemy_store as store:
+        await store.insert_blame_data([_blame(1)])
+        await store.insert_blame_data([_blame(2)])
+
+        result = await store.session.execute(select(GitBlame))
+        assert result.scalars().all() == []
+
+        await store.insert_blame_data([_blame(3)])
+
+        result = await store.session.execute(select(GitBlame))
+        assert len(result.scalars().all()) == 3
+
+        await store.insert_blame_data([_blame(4)])
+        assert await store.has_any_git_blame(test_repo_id)
+
+        result = await store.session.execute(select(GitBlame))
+        assert len(result.scalars().all()) == 4
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_shares_last_synced_across_inserts(sqlalchemy_store):
+    """Test that rows written in one store session share a last_synced default."""
+    test_repo_id = uuid.uuid4()
+
+    async with sqlalchemy_store as store:
+        await store.insert_git_file_data([
+            GitFile(repo_id=test_repo_id, path="a.txt", executable=False, contents="a")
+        ])
+        await store.insert_git_commit_data([
+            GitCommit(
+                repo_id=test_repo_id,
+                hash="abc123",
+                message="Initial commit",
+                author_name="Test Author",
+                author_email="author@example.com",
+                author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                committer_name="Test Author",
+                committer_email="author@example.com",
+                committer_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                parents=0,
+            )
+        ])
+
+        file_row = (await store.session.execute(select(GitFile))).scalars().one()
+        commit_row = (await store.session.execute(select(GitCommit))).scalars().one()
+        assert file_row.last_synced == commit_row.last_synced
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_query_budget(sqlalchemy_store, query_counter):
+    """Test that batch writes and probes stay at one statement each."""
+    test_repo_id = uuid.uuid4()
+    blame_rows = [
+        GitBlame(
+            repo_id=test_repo_id,
+            path="file.txt",
+            line_no=line_no,
+            author_email="author@example.com",
+            author_name="Test Author",
+            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            commit_hash="abc123",
+            line=f"line {line_no}",
+        )
+        for line_no in range(1, 251)
+    ]
+
+    async with sqlalchemy_store as store:
+        statements = query_counter(store.engine)
+
+        await store.insert_repo(Repo(id=test_repo_id, repo="owner/repo"))
+        assert len(statements) == 1
+
+        await store.insert_blame_data(blame_rows)
+        assert len(statements) == 2
+
+        await store.existence_snapshot(test_repo_id)
+        await store.has_any_git_blame(test_repo_id)
+        assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_reuses_upsert_statements(sqlalchemy_store):
+    """Test that repeated batches reuse one prebuilt upsert statement."""
+    test_repo_id = uuid.uuid4()
+
+    async with sqlalchemy_store as store:
+        for i in range(2):
+            await store.insert_git_file_data([
+                GitFile(repo_id=test_repo_id, path=f"{i}.txt", executable=False, contents="")
+            ])
+
+        assert list(store._upsert_statements) == [(
+            GitFile,
+            ("repo_id", "path"),
+            ("executable", "contents", "last_synced"),
+        )]
+        result = await store.session.execute(select(GitFile))
+        assert len(result.scalars().all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_has_any_probes(sqlalchemy_store):
+    """Test that has_any_* report rows per repo without counting them."""
+    test_repo_id = uuid.uuid4()
+
+    async with sqlalchemy_store as store:
+        assert not await store.has_any_git_files(test_repo_id)
+
+        await store.insert_git_file_data([
+            GitFile(repo_id=test_repo_id, path=f"{i}.txt", executable=False, contents="")
+            for i in range(3)
+        ])
+
+        assert await store.has_any_git_files(test_repo_id)
+        assert not await store.has_any_git_files(uuid.uuid4())
+        assert not await store.has_any_git_commit_stats(test_repo_id)
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_has_any_probes_use_autocommit_connection():
+    """Test that Postgres probes bypass the session on one AUTOCOMMIT connection."""
+    store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+    probe_conn = MagicMock()
+    probe_conn.execution_options = AsyncMock(return_value=probe_conn)
+    probe_conn.execute = AsyncMock(return_value=MagicMock(first=MagicMock(return_value=(1,))))
+    probe_conn.close = AsyncMock()
+    store._engine = MagicMock()
+    store._engine.dialect.name = "postgresql"
+    store._engine.connect = AsyncMock(return_value=probe_conn)
+    store._owns_engine = False
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.close = AsyncMock()
+    store.session = session
+
+    assert await store.has_any_git_files(uuid.uuid4())
+    assert await store.has_any_git_commit_stats(uuid.uuid4())
+    await store.__aexit__(None, None, None)
+
+    store._engine.connect.assert_awaited_once()
+    probe_conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+    assert probe_conn.execute.await_count == 2
+    session.execute.assert_not_awaited()
+    probe_conn.close.assert_awaited_once()
+    assert store._autocommit_conn is None
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_existence_snapshot(sqlalchemy_store):
+    """Test that one snapshot query reports which git tables hold repo rows."""
+    test_repo_id = uuid.uuid4()
+
+    async with sqlalchemy_store as store:
+        assert await store.existence_snapshot(test_repo_id) == {
+            "git_files": False,
+            "git_commit_stats": False,
+            "git_blame": False,
+        }
+
+        await store.insert_git_file_data([
+            GitFile(repo_id=test_repo_id, path="a.txt", executable=False, contents="a")
+        ])
+        assert await store.existence_snapshot(test_repo_id) == {
+            "git_files": True,
+            "git_commit_stats": False,
+            "git_blame": False,
+        }
+        assert await store.existence_snapshot(uuid.uuid4()) == {
+            "git_files": False,
+            "git_commit_stats": False,
+            "git_blame": False,
+        }
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_insert_blame_data_uses_copy_for_asyncpg():
+    """Test that large blame batches on asyncpg are staged with COPY then upserted."""
+    store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+    store._sync_started_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    test_repo_id = uuid.uuid4()
+
+    driver_conn = MagicMock()
+    driver_conn.copy_records_to_table = AsyncMock()
+    mock_conn = MagicMock()
+    mock_conn.execute = AsyncMock()
+    mock_conn.get_raw_connection = AsyncMock(
+        return_value=MagicMock(driver_connection=driver_conn)
+    )
+    store.session = MagicMock()
+    store.session.connection = AsyncMock(return_value=mock_conn)
+    store.session.commit = AsyncMock()
+
+    rows = [
+        {
+            "repo_id": test_repo_id,
+            "path": "file.txt",
+            "line_no": line_no,
+            "author_email": "author@example.com",
+            "author_name": "Test Author",
+            "author_when": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "commit_hash": "abc123",
+            "line": f"line {line_no}",
+        }
+        for line_no in range(1, 1001)
+    ]
+    with patch("storage._COPY_MIN_ROWS", 1000):
+        await store.insert_blame_data(rows)
+
+    driver_conn.copy_records_to_table.assert_awaited_once()
+    args, kwargs = driver_conn.copy_records_to_table.call_args
+    assert args == ("_copy_git_blame",)
+    assert kwargs["columns"][:3] == ["repo_id", "path", "line_no"]
+    assert len(kwargs["records"]) == 1000
+    assert kwargs["records"][0][-1] == store._sync_started_at
+
+    create_sql = str(mock_conn.execute.call_args_list[0].args[0])
+    assert "CREATE TEMP TABLE IF NOT EXISTS" in create_sql
+    upsert_sql = str(
+        mock_conn.execute.call_args_list[1].args[0].compile(dialect=store.engine.dialect)
+    )
+    assert "FROM _copy_git_blame" in upsert_sql
+    assert "ON CONFLICT (repo_id, path, line_no) DO UPDATE" in upsert_sql
+    store.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_copy_upsert_passes_guid_and_datetime_values():
+    """Test that COPY records keep UUID and aware datetime objects for asyncpg."""
+    store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+    test_repo_id = uuid.uuid4()
+    committed_at = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+    driver_conn = MagicMock()
+    driver_conn.copy_records_to_table = AsyncMock()
+    mock_conn = MagicMock()
+    mock_conn.execute = AsyncMock()
+    mock_conn.get_raw_connection = AsyncMock(
+        return_value=MagicMock(driver_connection=driver_conn)
+    )
+    store.session = MagicMock()
+    store.session.connection = AsyncMock(return_value=mock_conn)
+    store.session.commit = AsyncMock()
+
+    rows = [
+        {"repo_id": test_repo_id, "hash": "sha1", "author_when": committed_at},
+        {"repo_id": test_repo_id, "hash": "sha1", "author_when": committed_at},
+    ]
+    await store._copy_upsert_many(
+        GitCommit, rows, ["repo_id", "hash"], ["author_when"]
+    )
+
+    _, kwargs = driver_conn.copy_records_to_table.call_args
+    assert kwargs["columns"] == ["repo_id", "hash", "author_when"]
+    # GUID's bind processing is bypassed by COPY; asyncpg encodes these
+    # natively, so the staged values must not be stringified or hex-encoded.
+    assert kwargs["records"] == [(test_repo_id, "sha1", committed_at)]
+    repo_id, _, author_when = kwargs["records"][0]
+    assert isinstance(repo_id, uuid.UUID)
+    assert author_when.tzinfo is not None
+
+    upsert_sql = str(
+        mock_conn.execute.call_args_list[1].args[0].compile(dialect=store.engine.dialect)
+    )
+    assert "SELECT _copy_git_commits.repo_id" in upsert_sql
+    assert "ON CONFLICT (repo_id, hash) DO UPDATE" in upsert_sql
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_insert_git_commit_data_uses_copy_for_asyncpg():
+    """Test that large commit batches on asyncpg take the COPY staging path."""
+    store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+    store._sync_started_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    test_repo_id = uuid.uuid4()
+    store.session = MagicMock()
+
+    rows = [
+        {"repo_id": test_repo_id, "hash": f"sha{i}", "message": "msg", "parents": 1}
+        for i in range(3)
+    ]
+    with (
+        patch("storage._COPY_MIN_ROWS", 3),
+        patch.object(store, "_copy_upsert_many", AsyncMock()) as copy_upsert,
+    ):
+        await store.insert_git_commit_data(rows)
+
+    copy_upsert.assert_awaited_once()
+    model, staged, conflict_columns, _ = copy_upsert.await_args.args
+    assert model is GitCommit
+    assert [row["hash"] for row in staged] == ["sha0", "sha1", "sha2"]
+    assert conflict_columns == ["repo_id", "hash"]
+
+
 @pytest.mark.asyncio
 async def test_sqlalchemy_store_session_management(test_db_url):
     """Test session lifecycle management in SQLAlchemyStore."""
@@ -881,51 +1238,244 @@ async def test_clickhouse_store_insert_git_file_data_calls_insert():
     ]
 
 
+@pytest.mark.asyncio
+async def test_clickhouse_store_existence_snapshot_single_query():
+    test_repo_id = uuid.uuid4()
+
+    mock_client = MagicMock()
+    mock_client.command = MagicMock()
+    mock_client.query = MagicMock(return_value=MagicMock(result_rows=[]))
+    mock_client.close = MagicMock()
+
+    import sys
+    from types import SimpleNamespace
+
+    get_client = MagicMock(return_value=mock_client)
+    fake_clickhouse_connect = SimpleNamespace(get_client=get_client)
+
+    with patch.dict(sys.modules, {"clickhouse_connect": fake_clickhouse_connect}):
+        store = ClickHouseStore("clickhouse://localhost:8123/default")
+        async with store:
+            mock_client.query.reset_mock()
+            mock_client.query.return_value = MagicMock(result_rows=[(1, 0, 1)])
+            snapshot = await store.existence_snapshot(test_repo_id)
+
+    assert snapshot == {
+        "git_files": True,
+        "git_commit_stats": False,
+        "git_blame": True,
+    }
+    mock_client.query.assert_called_once()
+    args, kwargs = mock_client.query.call_args
+    for table in ("git_files", "git_commit_stats", "git_blame"):
+        assert f"FROM {table} WHERE" in args[0]
+    assert kwargs["parameters"] == {"repo_id": str(test_repo_id)}
+
+
+@pytest.mark.asyncio
+async def test_clickhouse_store_insert_blame_data_passes_rows_in_column_order():
+    test_repo_id = uuid.uuid4()
+    blame_data = [
+        GitBlame(
+            repo_id=test_repo_id,
+            path="file.txt",
+            line_no=1,
+            author_email="author@example.com",
+            author_name="Test Author",
+            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            commit_hash="abc123",
+            line="line 1 content",
+        ),
+        {
+            "repo_id": str(test_repo_id),
+            "path": "file.txt",
+            "line_no": 2,
+            "author_email": "author@example.com",
+            "author_name": "Test Author",
+            "author_when": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "commit_hash": "abc123",
+            "line": "line 2 content",
+        },
+    ]
+
+    mock_client = MagicMock()
+    mock_client.query = MagicMock(return_value=MagicMock(result_rows=[]))
+
+    import sys
+    from types import SimpleNamespace
+
+    get_client = MagicMock(return_value=mock_client)
+    fake_clickhouse_connect = SimpleNamespace(get_client=get_client)
+
+    with patch.dict(sys.modules, {"clickhouse_connect": fake_clickhouse_connect}):
+        store = ClickHouseStore("clickhouse://localhost:8123/default")
+        async with store:
+            await store.insert_blame_data(blame_data)
+
+    args, kwargs = mock_client.insert.call_args
+    assert args[0] == "git_blame"
+    columns = kwargs["column_names"]
+    matrix = args[1]
+    assert len(matrix) == 2
+    for line_no, row in enumerate(matrix, start=1):
+        values = dict(zip(columns, row))
+        assert values["repo_id"] == test_repo_id
+        assert values["line_no"] == line_no
+        assert values["line"] == f"line {line_no} content"
+        assert values["author_when"] == datetime(2024, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_clickhouse_store_insert_git_commit_data_dict_missing_fields():
+    test_repo_id = uuid.uuid4()
+    commit_data = [
+        {
+            "repo_id": str(test_repo_id),
+            "hash": "abc123",
+            "message": "Initial commit",
+            "author_name": "Test Author",
+            "author_email": "author@example.com",
+            "author_when": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        }
+    ]
+
+    mock_client = MagicMock()
+    mock_client.query = MagicMock(return_value=MagicMock(result_rows=[]))
+
+    import sys
+    from types import SimpleNamespace
+
+    get_client = MagicMock(return_value=mock_client)
+    fake_clickhouse_connect = SimpleNamespace(get_client=get_client)
+
+    with patch.dict(sys.modules, {"clickhouse_connect": fake_clickhouse_connect}):
+        store = ClickHouseStore("clickhouse://localhost:8123/default")
+        async with store:
+            await store.insert_git_commit_data(commit_data)
+
+    args, kwargs = mock_client.insert.call_args
+    values = dict(zip(kwargs["column_names"], args[1][0]))
+    assert values["hash"] == "abc123"
+    assert values["committer_name"] is None
+    assert values["committer_when"] is None
+    assert values["parents"] == 0
+
+
+@pytest.mark.asyncio
+async def test_clickhouse_store_insert_git_commit_stats_defaults_file_modes():
+    test_repo_id = uuid.uuid4()
+
+    def _stat(path, **modes):
+        return GitCommitStat(
+            repo_id=test_repo_id,
+            commit_hash="abc123",
+            file_path=path,
+            additions=1,
+            deletions=0,
+            **modes,
+        )
+
+    mock_client = MagicMock()
+    mock_client.query = MagicMock(return_value=MagicMock(result_rows=[]))
+
+    import sys
+    from types import SimpleNamespace
+
+    get_client = MagicMock(return_value=mock_client)
+    fake_clickhouse_connect = SimpleNamespace(get_client=get_client)
+
+    with patch.dict(sys.modules, {"clickhouse_connect": fake_clickhouse_connect}):
+        store = ClickHouseStore("clickhouse://localhost:8123/default")
+        async with store:
+            await store.insert_git_commit_stats([_stat("a.py"), _stat("b.py")])
+            args, kwargs = mock_client.insert.call_args
+            assert "old_file_mode" in kwargs["column_names"]
+            assert "new_file_mode" in kwargs["column_names"]
+            first = dict(zip(kwargs["column_names"], args[1][0]))
+            assert first["old_file_mode"] == "unknown"
+            assert first["new_file_mode"] == "unknown"
+
+            await store.insert_git_commit_stats([
+                _stat("a.py"),
+                _stat("c.py", old_file_mode="100644", new_file_mode="100755"),
+            ])
+            args, kwargs = mock_client.insert.call_args
+            values = dict(zip(kwargs["column_names"], args[1][1]))
+            assert values["old_file_mode"] == "100644"
+            assert values["new_file_mode"] == "100755"
+
+
 # MongoDB Tests
 
 
-def _create_mock_collection():
-    """Helper function to create a mock MongoDB collection with standard methods."""
-    mock_collection = MagicMock()
-    # Mock async methods
-    mock_collection.update_one = AsyncMock(return_value=MagicMock(upserted_id=None))
-    mock_collection.bulk_write = AsyncMock(return_value=MagicMock())
-    mock_collection.find_one = AsyncMock(return_value=None)
-    mock_collection.find = MagicMock(
-        return_value=MagicMock(to_list=AsyncMock(return_value=[]))
-    )
-    mock_collection.count_documents = AsyncMock(return_value=0)
-    return mock_collection
+class FakeCursor:
+    """Empty Motor cursor, usable with both ``to_list`` and ``async for``."""
+
+    def __init__(self):
+        self.to_list = AsyncMock(return_value=[])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class FakeCollection:
+    """Stand-in Motor collection exposing the methods MongoStore calls."""
+
+    def __init__(self):
+        self.insert_one = AsyncMock(return_value=SimpleNamespace(inserted_id=None))
+        self.update_one = AsyncMock(return_value=SimpleNamespace(upserted_id=None))
+        self.bulk_write = AsyncMock()
+        self.find_one = AsyncMock(return_value=None)
+        self.find = MagicMock(return_value=FakeCursor())
+        self.count_documents = AsyncMock(return_value=0)
+        self.create_index = AsyncMock(return_value="index")
+
+
+class FakeDB(dict):
+    """Database that creates a FakeCollection the first time a name is used."""
+
+    name = "test_db"
+
+    def __missing__(self, name):
+        collection = self[name] = FakeCollection()
+        return collection
+
+
+class FakeClient:
+    """Motor client serving a single FakeDB under any database name."""
+
+    def __init__(self):
+        self.db = FakeDB()
+        self.requested = []
+        self.close = MagicMock()
+        self.get_default_database = MagicMock(return_value=self.db)
+
+    def __getitem__(self, name):
+        self.requested.append(name)
+        return self.db
+
+
+@pytest.fixture
+def fake_motor_client(monkeypatch):
+    """Patch AsyncIOMotorClient to hand out one FakeClient."""
+    client = FakeClient()
+    monkeypatch.setattr("storage.AsyncIOMotorClient", lambda *_args, **_kwargs: client)
+    return client
 
 
 @pytest_asyncio.fixture
-async def mongo_store():
+async def mongo_store(fake_motor_client):
     """Create a MongoStore instance with mocked MongoDB client for testing."""
-    # Mock the AsyncIOMotorClient to avoid actual connection
-    with patch("storage.AsyncIOMotorClient") as mock_client_class:
-        # Setup the mock client and database
-        mock_client = MagicMock()
-        mock_db = MagicMock()
-        mock_collections = {}
-
-        def get_collection(self_arg, name):
-            if name not in mock_collections:
-                mock_collections[name] = _create_mock_collection()
-            return mock_collections[name]
-
-        mock_db.__getitem__ = get_collection
-        mock_db.name = "test_db"
-        mock_client.__getitem__ = MagicMock(return_value=mock_db)
-        mock_client.close = MagicMock()
-        mock_client_class.return_value = mock_client
-
-        # Create the store instance normally to test constructor
-        store = MongoStore("mongodb://localhost:27017", db_name="test_db")
-
-        # Manually set the db since we're not using the context manager
-        store.db = mock_db
+    # Create the store instance normally to test constructor
+    store = MongoStore("mongodb://localhost:27017", db_name="test_db")
 
-        yield store
+    # Manually set the db since we're not using the context manager
+    store.db = fake_motor_client.db
+
+    yield store
 
 
 @pytest.mark.asyncio
@@ -936,75 +1486,82 @@ async def test_mongo_store_init_with_empty_connection_string():
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_init_with_connection_string():
+async def test_mongo_store_init_with_connection_string(fake_motor_client):
     """Test that MongoStore initializes properly with a connection string."""
-    with patch("storage.AsyncIOMotorClient"):
-        store = MongoStore("mongodb://localhost:27017/test_db")
-        assert store.db_name is None
-        assert store.db is None
+    store = MongoStore("mongodb://localhost:27017/test_db")
+    assert store.db_name is None
+    assert store.db is None
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_init_with_db_name():
+async def test_mongo_store_init_with_db_name(fake_motor_client):
     """Test that MongoStore initializes properly with explicit db_name."""
-    with patch("storage.AsyncIOMotorClient"):
-        store = MongoStore("mongodb://localhost:27017", db_name="my_database")
-        assert store.db_name == "my_database"
-        assert store.db is None
+    store = MongoStore("mongodb://localhost:27017", db_name="my_database")
+    assert store.db_name == "my_database"
+    assert store.db is None
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_context_manager_with_db_name():
+async def test_mongo_store_context_manager_with_db_name(fake_motor_client):
     """Test that MongoStore can be used as an async context manager with explicit db_name."""
-    with patch("storage.AsyncIOMotorClient") as mock_client_class:
-        mock_client = MagicMock()
-        mock_db = MagicMock()
-        mock_db.name = "my_database"
-        mock_client.__getitem__ = MagicMock(return_value=mock_db)
-        mock_client_class.return_value = mock_client
+    store = MongoStore("mongodb://localhost:27017", db_name="my_database")
 
-        store = MongoStore("mongodb://localhost:27017", db_name="my_database")
-
-        async with store as s:
-            assert s.db is not None
-            assert s == store
-            mock_client.__getitem__.assert_called_once_with("my_database")
+    async with store as s:
+        assert s.db is not None
+        assert s == store
+        assert fake_motor_client.requested == ["my_database"]
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_context_manager_with_connection_string_db():
+async def test_mongo_store_context_manager_with_connection_string_db(fake_motor_client):
     """Test MongoStore context manager with database in connection string."""
-    with patch("storage.AsyncIOMotorClient") as mock_client_class:
-        mock_client = MagicMock()
-        mock_db = MagicMock()
-        mock_db.name = "mydb"
-        mock_client.get_default_database = MagicMock(return_value=mock_db)
-        mock_client_class.return_value = mock_client
+    store = MongoStore("mongodb://localhost:27017/mydb")
 
-        store = MongoStore("mongodb://localhost:27017/mydb")
+    async with store as s:
+        assert s.db is fake_motor_client.db
+        assert s == store
 
-        async with store as s:
-            assert s.db is not None
-            assert s == store
+
+@pytest.mark.asyncio
+async def test_mongo_store_context_manager_creates_git_indexes_once(
+    fake_motor_client, monkeypatch
+):
+    """Test that entering the store builds repo-prefixed indexes once per database."""
+    monkeypatch.setattr("storage._MONGO_INDEXED_DBS", set())
+    collections = fake_motor_client.db
+
+    async with MongoStore("mongodb://localhost:27017", db_name="my_database"):
+        pass
+    async with MongoStore("mongodb://localhost:27017", db_name="my_database"):
+        pass
+
+    assert set(collections) == {
+        "git_files",
+        "git_commits",
+        "git_commit_stats",
+        "git_blame",
+        "git_pull_requests",
+    }
+    collections["git_blame"].create_index.assert_awaited_once_with(
+        [("repo_id", 1), ("path", 1), ("line_no", 1)]
+    )
+    for collection in collections.values():
+        assert collection.create_index.await_count == 1
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_context_manager_without_db_raises_error():
+async def test_mongo_store_context_manager_without_db_raises_error(fake_motor_client):
     """Test that MongoStore raises error when no database is specified."""
     from pymongo.errors import ConfigurationError
 
-    with patch("storage.AsyncIOMotorClient") as mock_client_class:
-        mock_client = MagicMock()
-        mock_client.get_default_database = MagicMock(
-            side_effect=ConfigurationError("No default database")
-        )
-        mock_client_class.return_value = mock_client
-
-        store = MongoStore("mongodb://localhost:27017")
+    fake_motor_client.get_default_database.side_effect = ConfigurationError(
+        "No default database"
+    )
+    store = MongoStore("mongodb://localhost:27017")
 
-        with pytest.raises(ValueError, match="No default database specified"):
-            async with store:
-                pass
+    with pytest.raises(ValueError, match="No default database specified"):
+        async with store:
+            pass
 
 
 @pytest.mark.asyncio
@@ -1020,14 +1577,13 @@ async def test_mongo_store_insert_repo(mongo_store):
 
     await mongo_store.insert_repo(test_repo)
 
-    # Verify the repo was inserted (update_one was called)
-    mongo_store.db["repos"].update_one.assert_called_once()
-    call_args = mongo_store.db["repos"].update_one.call_args
+    # Verify the repo was inserted directly without an upsert
+    mongo_store.db["repos"].insert_one.assert_called_once()
+    mongo_store.db["repos"].update_one.assert_not_called()
+    call_args = mongo_store.db["repos"].insert_one.call_args
 
-    # Verify the filter includes the repo id
+    # Verify the document is keyed by the repo id
     assert call_args[0][0]["_id"] == str(test_repo.id)
-    # Verify upsert is True
-    assert call_args[1]["upsert"] is True
 
 
 @pytest.mark.asyncio
@@ -1041,55 +1597,125 @@ async def test_mongo_store_insert_repo_upsert(mongo_store):
         tags=[],
     )
 
+    # Second insert hits the existing _id and falls back to an upsert
+    mongo_store.db["repos"].insert_one.side_effect = [
+        MagicMock(inserted_id=str(test_repo.id)),
+        DuplicateKeyError("duplicate key"),
+    ]
+
     # Insert the repo twice with different refs
     await mongo_store.insert_repo(test_repo)
     test_repo.ref = "develop"
     await mongo_store.insert_repo(test_repo)
 
-    # Verify update_one was called twice
-    assert mongo_store.db["repos"].update_one.call_count == 2
+    assert mongo_store.db["repos"].insert_one.call_count == 2
+    mongo_store.db["repos"].update_one.assert_called_once()
+    call_args = mongo_store.db["repos"].update_one.call_args
+    assert call_args[0][0]["_id"] == str(test_repo.id)
+    assert call_args[0][1]["$set"]["ref"] == "develop"
+    assert call_args[1]["upsert"] is True
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_git_file_data(mongo_store):
-    """Test inserting git file data into MongoDB."""
+async def test_mongo_store_has_any_probes_with_projected_find_one(mongo_store):
+    """Test that has_any_* fetch at most one _id instead of counting."""
     test_repo_id = uuid.uuid4()
+    files = mongo_store.db["git_files"]
+    files.find_one.return_value = {"_id": "x"}
 
-    file_data = [
-        GitFile(
-            repo_id=test_repo_id,
-            path="file1.txt",
-            executable=False,
-            contents="content1",
-        ),
-        GitFile(
-            repo_id=test_repo_id,
-            path="file2.txt",
-            executable=True,
-            contents="content2",
-        ),
+    assert await mongo_store.has_any_git_files(test_repo_id)
+    assert not await mongo_store.has_any_git_blame(test_repo_id)
+
+    files.find_one.assert_awaited_once_with(
+        {"repo_id": str(test_repo_id)}, projection={"_id": 1}
+    )
+    files.count_documents.assert_not_called()
+
+
+def _mongo_files(repo_id):
+    return [
+        GitFile(repo_id=repo_id, path="file1.txt", executable=False, contents="content1"),
+        GitFile(repo_id=repo_id, path="file2.txt", executable=True, contents="content2"),
     ]
 
-    await mongo_store.insert_git_file_data(file_data)
 
-    # Verify bulk_write was called
-    mongo_store.db["git_files"].bulk_write.assert_called_once()
-    call_args = mongo_store.db["git_files"].bulk_write.call_args
+def _mongo_commits(repo_id):
+    return [
+        GitCommit(
+            repo_id=repo_id,
+            hash=sha,
+            message=f"Commit {sha}",
+            author_name="Test Author",
+            author_email="test@example.com",
+            author_when=datetime(2024, 1, day, tzinfo=timezone.utc),
+            committer_name="Test Committer",
+            committer_email="committer@example.com",
+            committer_when=datetime(2024, 1, day, tzinfo=timezone.utc),
+            parents=day - 1,
+        )
+        for day, sha in ((1, "abc123"), (2, "def456"))
+    ]
 
-    # Verify operations list has 2 items
-    operations = call_args[0][0]
+
+def _mongo_commit_stats(repo_id):
+    return [
+        GitCommitStat(
+            repo_id=repo_id,
+            commit_hash="abc123",
+            file_path=path,
+            additions=10,
+            deletions=5,
+            old_file_mode="100644",
+            new_file_mode=mode,
+        )
+        for path, mode in (("file1.txt", "100644"), ("file2.txt", "100755"))
+    ]
+
+
+def _mongo_blame(repo_id):
+    return [
+        GitBlame(
+            repo_id=repo_id,
+            path="file.txt",
+            line_no=line_no,
+            author_email="author@example.com",
+            author_name="Test Author",
+            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            commit_hash="abc123",
+            line=f"line {line_no} content",
+        )
+        for line_no in (1, 2)
+    ]
+
+
+MONGO_INSERT_CASES = [
+    ("insert_git_file_data", _mongo_files, "git_files"),
+    ("insert_git_commit_data", _mongo_commits, "git_commits"),
+    ("insert_git_commit_stats", _mongo_commit_stats, "git_commit_stats"),
+    ("insert_blame_data", _mongo_blame, "git_blame"),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method,factory,collection", MONGO_INSERT_CASES)
+async def test_mongo_store_insert_batch_upsert(mongo_store, method, factory, collection):
+    """Test that each insert helper sends one unordered bulk_write per batch."""
+    await getattr(mongo_store, method)(factory(uuid.uuid4()))
+
+    bulk_write = mongo_store.db[collection].bulk_write
+    bulk_write.assert_called_once()
+    operations = bulk_write.call_args[0][0]
     assert len(operations) == 2
-    # Verify ordered=False
-    assert call_args[1]["ordered"] is False
+    assert bulk_write.call_args[1]["ordered"] is False
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_git_file_data_empty_list(mongo_store):
+@pytest.mark.parametrize("method,factory,collection", MONGO_INSERT_CASES)
+async def test_mongo_store_insert_empty_list(mongo_store, method, factory, collection):
     """Test that inserting an empty list does not cause an error."""
-    await mongo_store.insert_git_file_data([])
+    await getattr(mongo_store, method)([])
 
-    # Verify bulk_write was not called
-    mongo_store.db["git_files"].bulk_write.assert_not_called()
+    mongo_store.db[collection].bulk_write.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -1117,88 +1743,52 @@ async def test_mongo_store_insert_git_file_data_upsert(mongo_store):
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_git_commit_data(mongo_store):
-    """Test inserting git commit data into MongoDB."""
+async def test_mongo_store_insert_blame_data_buffered_flushes_once(mongo_store):
+    """Test that buffered blame batches reach MongoDB in one bulk_write."""
     test_repo_id = uuid.uuid4()
+    mongo_store._insert_buffer.max_rows = 100
+    mongo_store._insert_buffer.max_delay_ms = 60_000
 
-    commit_data = [
-        GitCommit(
-            repo_id=test_repo_id,
-            hash="abc123",
-            message="Initial commit",
-            author_name="Test Author",
-            author_email="test@example.com",
-            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            committer_name="Test Committer",
-            committer_email="committer@example.com",
-            committer_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            parents=0,
-        ),
-        GitCommit(
-            repo_id=test_repo_id,
-            hash="def456",
-            message="Second commit",
-            author_name="Test Author",
-            author_email="test@example.com",
-            author_when=datetime(2024, 1, 2, tzinfo=timezone.utc),
-            committer_name="Test Committer",
-            committer_email="committer@example.com",
-            committer_when=datetime(2024, 1, 2, tzinfo=timezone.utc),
-            parents=1,
-        ),
-    ]
-
-    await mongo_store.insert_git_commit_data(commit_data)
-
-    # Verify bulk_write was called
-    mongo_store.db["git_commits"].bulk_write.assert_called_once()
-    call_args = mongo_store.db["git_commits"].bulk_write.call_args
-
-    # Verify operations list has 2 items
-    operations = call_args[0][0]
-    assert len(operations) == 2
+    for line_no in range(1, 4):
+        await mongo_store.insert_blame_data([
+            GitBlame(
+                repo_id=test_repo_id,
+                path="file.txt",
+                line_no=line_no,
+                author_email="author@example.com",
+                author_name="Test Author",
+                author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                commit_hash="abc123",
+                line=f"line {line_no} content",
+            )
+        ])
 
+    mongo_store.db["git_blame"].bulk_write.assert_not_called()
 
-@pytest.mark.asyncio
-async def test_mongo_store_insert_git_commit_data_empty_list(mongo_store):
-    """Test that inserting an empty list does not cause an error."""
-    await mongo_store.insert_git_commit_data([])
+    await mongo_store._insert_buffer.flush_all()
 
-    # Verify bulk_write was not called
-    mongo_store.db["git_commits"].bulk_write.assert_not_called()
+    mongo_store.db["git_blame"].bulk_write.assert_called_once()
+    operations = mongo_store.db["git_blame"].bulk_write.call_args[0][0]
+    assert len(operations) == 3
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_git_commit_stats(mongo_store):
-    """Test inserting git commit stats into MongoDB."""
-    test_repo_id = uuid.uuid4()
-
-    commit_stats = [
-        GitCommitStat(
-            repo_id=test_repo_id,
-            commit_hash="abc123",
-            file_path="file1.txt",
-            additions=10,
-            deletions=5,
-            old_file_mode="100644",
-            new_file_mode="100644",
-        ),
-        GitCommitStat(
-            repo_id=test_repo_id,
-            commit_hash="abc123",
-            file_path="file2.txt",
-            additions=20,
-            deletions=3,
-            old_file_mode="100644",
-            new_file_mode="100755",
-        ),
+async def test_mongo_store_upsert_many_with_dict_payload(mongo_store):
+    """Test _upsert_many with dict payload instead of model instances."""
+    test_data = [
+        {"repo_id": "test-repo", "path": "file1.txt", "contents": "content1"},
+        {"repo_id": "test-repo", "path": "file2.txt", "contents": "content2"},
     ]
 
-    await mongo_store.insert_git_commit_stats(commit_stats)
+    await mongo_store._upsert_many(
+        "test_collection",
+        test_data,
+        lambda obj: f"{obj['repo_id']}:{obj['path']}",
+    )
 
-    # Verify bulk_write was called
-    mongo_store.db["git_commit_stats"].bulk_write.assert_called_once()
-    call_args = mongo_store.db["git_commit_stats"].bulk_write.call_args
+    # Verify bulk_write was called on test_collection
+    mongo_store.db["test_collection"].bulk_write.assert_called_once()
+    call_args = mongo_store.db["test_collection"].bulk_write.call_args
 
     # Verify operations list has 2 items
     operations = call_args[0][0]
@@ -1206,83 +1796,109 @@ async def test_mongo_store_insert_git_commit_stats(mongo_store):
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_git_commit_stats_empty_list(mongo_store):
-    """Test that inserting an empty list does not cause an error."""
-    await mongo_store.insert_git_commit_stats([])
+async def test_mongo_store_upsert_many_shards_large_batches(mongo_store):
+    """Test that large unordered bulks are split into concurrent shards."""
+    test_data = [
+        {"repo_id": "test-repo", "path": f"file{i}.txt", "contents": ""}
+        for i in range(1200)
+    ]
 
-    # Verify bulk_write was not called
-    mongo_store.db["git_commit_stats"].bulk_write.assert_not_called()
+    with patch("storage._MONGO_SHARD_MIN_OPS", 500), patch(
+        "storage._MONGO_MAX_SHARDS", 8
+    ):
+        await mongo_store._upsert_many(
+            "test_collection", test_data, id_fields=("repo_id", "path")
+        )
+
+    calls = mongo_store.db["test_collection"].bulk_write.call_args_list
+    assert [len(call.args[0]) for call in calls] == [600, 600]
+    assert all(call.kwargs["ordered"] is False for call in calls)
+    ids = [op._filter["_id"] for call in calls for op in call.args[0]]
+    assert ids == [f"test-repo:file{i}.txt" for i in range(1200)]
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_blame_data(mongo_store):
-    """Test inserting git blame data into MongoDB."""
-    test_repo_id = uuid.uuid4()
+async def test_mongo_store_upsert_many_sends_pre_encoded_bson(mongo_store):
+    """Test that documents reach the driver already encoded as raw BSON."""
+    test_data = [{"repo_id": "test-repo", "path": "file1.txt", "contents": "content1"}]
 
-    blame_data = [
-        GitBlame(
-            repo_id=test_repo_id,
-            path="file.txt",
-            line_no=1,
-            author_email="author@example.com",
-            author_name="Test Author",
-            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            commit_hash="abc123",
-            line="line 1 content",
-        ),
-        GitBlame(
-            repo_id=test_repo_id,
-            path="file.txt",
-            line_no=2,
-            author_email="author@example.com",
-            author_name="Test Author",
-            author_when=datetime(2024, 1, 1, tzinfo=timezone.utc),
-            commit_hash="abc123",
-            line="line 2 content",
-        ),
-    ]
+    await mongo_store._upsert_many(
+        "test_collection",
+        test_data,
+        lambda obj: f"{obj['repo_id']}:{obj['path']}",
+    )
 
-    await mongo_store.insert_blame_data(blame_data)
-
-    # Verify bulk_write was called
-    mongo_store.db["git_blame"].bulk_write.assert_called_once()
-    call_args = mongo_store.db["git_blame"].bulk_write.call_args
-
-    # Verify operations list has 2 items
-    operations = call_args[0][0]
-    assert len(operations) == 2
+    operations = mongo_store.db["test_collection"].bulk_write.call_args[0][0]
+    payload = operations[0]._doc["$set"]
+    assert isinstance(payload, RawBSONDocument)
+    assert payload["_id"] == "test-repo:file1.txt"
+    assert payload["contents"] == "content1"
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_insert_blame_data_empty_list(mongo_store):
-    """Test that inserting an empty list does not cause an error."""
-    await mongo_store.insert_blame_data([])
+async def test_mongo_store_upsert_many_skips_hash_lookup_for_empty_collection(
+    mongo_store,
+):
+    """Test that a collection empty at first write is never queried for hashes."""
+    test_data = [
+        {"repo_id": "test-repo", "path": "file1.txt", "contents": "content1"},
+    ]
+    collection = mongo_store.db["test_collection"]
 
-    # Verify bulk_write was not called
-    mongo_store.db["git_blame"].bulk_write.assert_not_called()
+    await mongo_store._upsert_many(
+        "test_collection", test_data, id_fields=("repo_id", "path")
+    )
+    await mongo_store._upsert_many(
+        "test_collection", test_data, id_fields=("repo_id", "path")
+    )
+
+    collection.find_one.assert_awaited_once_with({}, {"_id": 1})
+    collection.find.assert_not_called()
+    assert collection.bulk_write.await_count == 2
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_upsert_many_with_dict_payload(mongo_store):
-    """Test _upsert_many with dict payload instead of model instances."""
+async def test_mongo_store_upsert_many_skips_unchanged_documents(mongo_store):
+    """Test that documents whose stored content hash matches are not rewritten."""
     test_data = [
         {"repo_id": "test-repo", "path": "file1.txt", "contents": "content1"},
         {"repo_id": "test-repo", "path": "file2.txt", "contents": "content2"},
     ]
+    collection = mongo_store.db["test_collection"]
 
     await mongo_store._upsert_many(
-        "test_collection",
-        test_data,
-        lambda obj: f"{obj['repo_id']}:{obj['path']}",
+        "test_collection", test_data, id_fields=("repo_id", "path")
     )
+    first_ops = collection.bulk_write.call_args[0][0]
+    stored = [
+        {"_id": op._filter["_id"], "_h": op._doc["$set"]["_h"]} for op in first_ops
+    ]
+    assert all(len(doc["_h"]) == 8 for doc in stored)
 
-    # Verify bulk_write was called on test_collection
-    mongo_store.db["test_collection"].bulk_write.assert_called_once()
-    call_args = mongo_store.db["test_collection"].bulk_write.call_args
+    # A later run finds the collection populated and checks stored hashes.
+    mongo_store._had_documents.clear()
+    collection.find_one.return_value = {"_id": stored[0]["_id"]}
+    cursor = MagicMock()
+    cursor.__aiter__.return_value = stored
+    collection.find.return_value = cursor
+    collection.bulk_write.reset_mock()
 
-    # Verify operations list has 2 items
-    operations = call_args[0][0]
-    assert len(operations) == 2
+    test_data[1]["contents"] = "changed"
+    await mongo_store._upsert_many(
+        "test_collection", test_data, id_fields=("repo_id", "path")
+    )
+
+    query = collection.find.call_args[0][0]
+    assert query == {"_id": {"$in": ["test-repo:file1.txt", "test-repo:file2.txt"]}}
+    ops = collection.bulk_write.call_args[0][0]
+    assert [op._filter["_id"] for op in ops] == ["test-repo:file2.txt"]
+
+    collection.bulk_write.reset_mock()
+    test_data[1]["contents"] = "content2"
+    await mongo_store._upsert_many(
+        "test_collection", test_data, id_fields=("repo_id", "path")
+    )
+    collection.bulk_write.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -1314,22 +1930,15 @@ async def test_mongo_store_bulk_operations_unordered(mongo_store):
 
 
 @pytest.mark.asyncio
-async def test_mongo_store_connection_cleanup():
+async def test_mongo_store_connection_cleanup(fake_motor_client):
     """Test that MongoStore properly closes connection on exit."""
-    with patch("storage.AsyncIOMotorClient") as mock_client_class:
-        mock_client = MagicMock()
-        mock_db = MagicMock()
-        mock_client.__getitem__ = MagicMock(return_value=mock_db)
-        mock_client.close = MagicMock()
-        mock_client_class.return_value = mock_client
+    store = MongoStore("mongodb://localhost:27017", db_name="test_db")
 
-        store = MongoStore("mongodb://localhost:27017", db_name="test_db")
+    async with store:
+        assert store.db is not None
 
-        async with store:
-            assert store.db is not None
-
-        # Verify client.close() was called
-        mock_client.close.assert_called_once()
+    # Verify client.close() was called
+    fake_motor_client.close.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -1354,9 +1963,22 @@ async def test_mongo_store_upsert_id_builder_functionality(mongo_store):
 
     # Verify that bulk_write was called with UpdateOne operations
     assert isinstance(operations[0], UpdateOne)
-    # The UpdateOne should have been created with the composite key
-    # We verify this indirectly by checking that bulk_write was called with one operation
     assert len(operations) == 1
+    # The UpdateOne should have been created with the composite key
+    assert operations[0]._filter == {"_id": f"{test_repo_id}:dir/file.txt"}
+
+
+@pytest.mark.asyncio
+async def test_mongo_store_upsert_many_keeps_prebuilt_id(mongo_store):
+    """Test that documents already carrying an _id are not re-keyed."""
+    await mongo_store._upsert_many(
+        "test_collection",
+        [{"_id": "prebuilt", "repo_id": "test-repo", "path": "file1.txt"}],
+        id_fields=("repo_id", "path"),
+    )
+
+    operations = mongo_store.db["test_collection"].bulk_write.call_args[0][0]
+    assert operations[0]._filter == {"_id": "prebuilt"}
 
 
 class TestMongoStoreMultipleRepos:
@@ -1424,6 +2046,11 @@ class TestMongoStoreMultipleRepos:
             )
             collection.count_documents = mock_count_documents
 
+            async def mock_find_one(filter_dict, projection=None):
+                return next(iter(collections_data[name].values()), None)
+
+            collection.find_one = mock_find_one
+
             # Store reference to raw data for test assertions
             collection._data = collections_data[name]
 
@@ -1881,6 +2508,54 @@ class TestSQLiteAsyncStorage:
 
         await store.engine.dispose()
 
+    @pytest.mark.asyncio
+    async def test_postgres_store_pool_sized_from_settings(self):
+        """Test that PostgreSQL pool sizing follows the DB_POOL_* settings."""
+        with patch("storage.DB_POOL_SIZE", 5), patch(
+            "storage.DB_MAX_OVERFLOW", 7
+        ), patch("storage.DB_POOL_TIMEOUT", 12):
+            store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+            pool = store.engine.pool
+
+        assert pool.size() == 5
+        assert pool._max_overflow == 7
+        assert pool._timeout == 12
+        await store.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_postgres_store_pool_size_zero_uses_null_pool(self):
+        """Test that DB_POOL_SIZE=0 disables connection pooling."""
+        from sqlalchemy.pool import NullPool
+
+        with patch("storage.DB_POOL_SIZE", 0):
+            store = SQLAlchemyStore("postgresql+asyncpg://localhost/mydb")
+            assert isinstance(store.engine.pool, NullPool)
+        await store.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_postgres_stores_share_engine_on_loop(self):
+        """Test that PostgreSQL stores on one event loop reuse a single engine."""
+        url = "postgresql+asyncpg://localhost/mydb"
+        first = SQLAlchemyStore(url)
+        second = SQLAlchemyStore(url)
+
+        assert first.engine is second.engine
+        assert SQLAlchemyStore(url, echo=True).engine is not first.engine
+
+        await close_all_engines()
+        assert SQLAlchemyStore(url).engine is not first.engine
+        await close_all_engines()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_stores_keep_private_engines(self, sqlite_memory_url):
+        """Test that SQLite stores do not share engines (or in-memory databases)."""
+        first = SQLAlchemyStore(sqlite_memory_url)
+        second = SQLAlchemyStore(sqlite_memory_url)
+
+        assert first.engine is not second.engine
+        await first.engine.dispose()
+        await second.engine.dispose()
+
     @pytest.mark.asyncio
     async def test_sqlite_store_multiple_sessions(self, sqlite_file_url):
         """Test that multiple sessions can be created with SQLite file store."""
@@ -1952,3 +2627,17 @@ class TestSQLiteAsyncStorage:
             )
             saved_files = result.scalars().all()
             assert len(saved_files) == 10
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_store_sqlite_connections_apply_pragmas(tmp_path):
+    """Test that each new SQLite connection is switched to WAL with a larger cache."""
+    store = SQLAlchemyStore(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}")
+    try:
+        async with store.engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1
+            assert (await conn.execute(text("PRAGMA cache_size"))).scalar() == -64000
+            assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2
+    finally:
+        await store.engine.dispose()
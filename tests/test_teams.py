@@ -63,6 +63,7 @@ async def test_mongo_store_teams():
         
         # Mock insert_teams (uses _upsert_many)
         store.db["teams"].bulk_write = AsyncMock()
+        store.db["teams"].find_one = AsyncMock(return_value=None)
         
         teams = [Team(id="t1", name="Team 1")]
         await store.insert_teams(teams)
@@ -1,12 +1,13 @@
 """Tests for utility functions in utils.py."""
 
-import os
-from unittest.mock import patch
+import asyncio
+from types import SimpleNamespace
 
 import pytest
 
+import utils
 from cli import build_parser
-from utils import SKIP_EXTENSIONS, is_skippable
+from utils import SKIP_EXTENSIONS, _bool_env, is_skippable, run_async
 
 
 class TestIsSkippable:
@@ -112,79 +113,52 @@ class TestIsSkippable:
         """Test that extension-based skipping covers common binary types."""
         assert is_skippable("video.avi")
         assert is_skippable("audio.wav")
+        assert is_skippable("bitmap.bmp")
+        assert is_skippable("scan.TIFF")
+        assert is_skippable("font.otf")
+        assert is_skippable("audio.flac")
+
+    def test_skip_directories(self):
+        """Test that files under vendored or build directories are skipped."""
+        assert is_skippable("node_modules/pkg/index.js")
+        assert is_skippable("src/__pycache__/mod.py")
+        assert is_skippable("/abs/build/out.txt")
+        assert not is_skippable("src/builder/main.py")
+        assert not is_skippable("docs/binary.md")
 
 
 class TestDBEchoConfiguration:
     """Test cases for DB_ECHO environment variable parsing."""
 
-    def test_db_echo_defaults_to_false_when_not_set(self):
-        """Test that DB_ECHO defaults to False when not set."""
-        with patch.dict(os.environ, {}, clear=False):
-            # Remove DB_ECHO if it exists
-            os.environ.pop("DB_ECHO", None)
-            # Re-evaluate the expression
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
-
-    def test_db_echo_true_for_true_value(self):
-        """Test that DB_ECHO is True when set to 'true'."""
-        with patch.dict(os.environ, {"DB_ECHO": "true"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is True
-
-    def test_db_echo_true_for_uppercase_true(self):
-        """Test that DB_ECHO is True when set to 'TRUE' (case-insensitive)."""
-        with patch.dict(os.environ, {"DB_ECHO": "TRUE"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is True
-
-    def test_db_echo_true_for_one(self):
-        """Test that DB_ECHO is True when set to '1'."""
-        with patch.dict(os.environ, {"DB_ECHO": "1"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is True
-
-    def test_db_echo_true_for_yes(self):
-        """Test that DB_ECHO is True when set to 'yes'."""
-        with patch.dict(os.environ, {"DB_ECHO": "yes"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is True
-
-    def test_db_echo_true_for_uppercase_yes(self):
-        """Test that DB_ECHO is True when set to 'YES' (case-insensitive)."""
-        with patch.dict(os.environ, {"DB_ECHO": "YES"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is True
-
-    def test_db_echo_false_for_false_value(self):
-        """Test that DB_ECHO is False when set to 'false'."""
-        with patch.dict(os.environ, {"DB_ECHO": "false"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
-
-    def test_db_echo_false_for_zero(self):
-        """Test that DB_ECHO is False when set to '0'."""
-        with patch.dict(os.environ, {"DB_ECHO": "0"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
-
-    def test_db_echo_false_for_no(self):
-        """Test that DB_ECHO is False when set to 'no'."""
-        with patch.dict(os.environ, {"DB_ECHO": "no"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
-
-    def test_db_echo_false_for_invalid_value(self):
-        """Test that DB_ECHO is False when set to an invalid value."""
-        with patch.dict(os.environ, {"DB_ECHO": "invalid"}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
-
-    def test_db_echo_false_for_empty_string(self):
-        """Test that DB_ECHO is False when set to an empty string."""
-        with patch.dict(os.environ, {"DB_ECHO": ""}):
-            result = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
-            assert result is False
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, False),
+            ("true", True),
+            ("TRUE", True),
+            ("1", True),
+            ("yes", True),
+            ("YES", True),
+            ("false", False),
+            ("0", False),
+            ("no", False),
+            ("invalid", False),
+            ("", False),
+        ],
+    )
+    def test_db_echo_parsing(self, monkeypatch, value, expected):
+        """Test that only true/1/yes (any case) enable DB_ECHO."""
+        if value is None:
+            monkeypatch.delenv("DB_ECHO", raising=False)
+        else:
+            monkeypatch.setenv("DB_ECHO", value)
+        assert _bool_env("DB_ECHO") is expected
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Build the CLI parser once; parse_args does not mutate it."""
+    return build_parser()
 
 
 class TestBatchProcessingCLIArguments:
@@ -193,9 +167,8 @@ class TestBatchProcessingCLIArguments:
     These tests exercise cli.py argument parsing for batch sync flows.
     """
 
-    def test_github_pattern_argument(self):
+    def test_github_pattern_argument(self, parser):
         """Test that --search argument is parsed correctly."""
-        parser = build_parser()
         test_args = [
             "sync",
             "git",
@@ -218,9 +191,8 @@ class TestBatchProcessingCLIArguments:
         assert args.date is None
         assert args.backfill == 1
 
-    def test_batch_processing_arguments_with_custom_values(self):
+    def test_batch_processing_arguments_with_custom_values(self, parser):
         """Test that batch processing arguments accept custom values."""
-        parser = build_parser()
         test_args = [
             "sync",
             "git",
@@ -253,9 +225,8 @@ class TestBatchProcessingCLIArguments:
         assert args.max_repos == 50
         assert args.use_async is True
 
-    def test_use_async_flag_default_is_false(self):
+    def test_use_async_flag_default_is_false(self, parser):
         """Test that --use-async flag defaults to False."""
-        parser = build_parser()
         args = parser.parse_args(
             [
                 "sync",
@@ -271,9 +242,8 @@ class TestBatchProcessingCLIArguments:
 
         assert args.use_async is False
 
-    def test_use_async_flag_when_provided(self):
+    def test_use_async_flag_when_provided(self, parser):
         """Test that --use-async flag is True when provided."""
-        parser = build_parser()
         args = parser.parse_args(
             [
                 "sync",
@@ -290,9 +260,8 @@ class TestBatchProcessingCLIArguments:
 
         assert args.use_async is True
 
-    def test_gitlab_pattern_argument(self):
+    def test_gitlab_pattern_argument(self, parser):
         """Test that --search argument is parsed correctly for GitLab."""
-        parser = build_parser()
         test_args = [
             "sync",
             "git",
@@ -315,9 +284,8 @@ class TestBatchProcessingCLIArguments:
         assert args.date is None
         assert args.backfill == 1
 
-    def test_gitlab_batch_processing_arguments_with_custom_values(self):
+    def test_gitlab_batch_processing_arguments_with_custom_values(self, parser):
         """Test that GitLab batch processing arguments accept custom values."""
-        parser = build_parser()
         test_args = [
             "sync",
             "git",
@@ -355,8 +323,7 @@ class TestBatchProcessingCLIArguments:
 
 
 class TestSyncTimeWindowCLIArguments:
-    def test_sync_local_accepts_date_backfill(self):
-        parser = build_parser()
+    def test_sync_local_accepts_date_backfill(self, parser):
         args = parser.parse_args(
             [
                 "sync",
@@ -374,8 +341,7 @@ class TestSyncTimeWindowCLIArguments:
         assert str(args.date) == "2025-01-02"
         assert args.backfill == 7
 
-    def test_sync_local_rejects_since_and_date_together(self):
-        parser = build_parser()
+    def test_sync_local_rejects_since_and_date_together(self, parser):
         with pytest.raises(SystemExit):
             parser.parse_args(
                 [
@@ -391,3 +357,30 @@ class TestSyncTimeWindowCLIArguments:
                     "2025-01-02",
                 ]
             )
+
+
+async def _answer():
+    return 42
+
+
+def test_run_async_without_uvloop(monkeypatch):
+    monkeypatch.setattr(utils, "uvloop", None)
+    assert run_async(_answer()) == 42
+
+
+def test_run_async_prefers_uvloop(monkeypatch):
+    used = []
+
+    def new_event_loop():
+        used.append("loop_factory")
+        return asyncio.new_event_loop()
+
+    def run(main):
+        used.append("run")
+        return asyncio.run(main)
+
+    monkeypatch.setattr(
+        utils, "uvloop", SimpleNamespace(new_event_loop=new_event_loop, run=run)
+    )
+    assert run_async(_answer()) == 42
+    assert len(used) == 1
@@ -1,71 +1,143 @@
+import asyncio
 import os
 import re
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Iterable, List, Union, Tuple, Set
+from typing import Any, Coroutine, Optional, Iterable, List, Union, Tuple, Set, TypeVar
 
 # Constants
 BATCH_SIZE = 1000
 
 
-def _int_env(name: str, default: int) -> int:
+def _int_env(name: str, default: int, minimum: int = 1) -> int:
     raw = os.getenv(name)
     if raw is None or not str(raw).strip():
         return int(default)
     try:
-        return max(1, int(str(raw).strip()))
+        return max(minimum, int(str(raw).strip()))
     except ValueError:
         return int(default)
 
 
+_TRUTHY = frozenset({"true", "1", "yes"})
+
+
+def _bool_env(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in _TRUTHY
+
+
 # Keep default concurrency conservative; override via env.
 MAX_WORKERS = _int_env("MAX_WORKERS", 4)
+# Rows to coalesce per table before a store write; 0 keeps inserts write-through.
+INSERT_BUFFER_ROWS = _int_env("INSERT_BUFFER_ROWS", 0)
+# SQL connection pool sizing; DB_POOL_SIZE=0 disables pooling (NullPool).
+DB_POOL_SIZE = _int_env("DB_POOL_SIZE", 20, minimum=0)
+DB_MAX_OVERFLOW = _int_env("DB_MAX_OVERFLOW", 30, minimum=0)
+DB_POOL_TIMEOUT = _int_env("DB_POOL_TIMEOUT", 30)
+# Log every SQL statement from SQLAlchemy stores.
+DB_ECHO = _bool_env("DB_ECHO")
 AGGREGATE_STATS_MARKER = "__AGGREGATE__"
 REPO_PATH = os.getenv("REPO_PATH", ".")
-SKIP_EXTENSIONS = {
-    ".png",
-    ".jpg",
-    ".jpeg",
-    ".gif",
-    ".ico",
-    ".pdf",
-    ".zip",
-    ".tar",
-    ".gz",
-    ".7z",
-    ".exe",
-    ".dll",
-    ".so",
-    ".dylib",
-    ".class",
-    ".pyc",
-    ".o",
-    ".obj",
-    ".bin",
-    ".bak",
-    ".tmp",
-    ".svg",
-    ".eot",
-    ".ttf",
-    ".woff",
-    ".woff2",
-    ".mp4",
-    ".mp3",
-    ".wav",
-    ".mov",
-    ".avi",
-    ".mkv",
-    ".webm",
-    ".jar",
-    ".war",
-    ".ear",
-}
+SKIP_EXTENSIONS = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".ico",
+        ".pdf",
+        ".zip",
+        ".tar",
+        ".gz",
+        ".7z",
+        ".exe",
+        ".dll",
+        ".so",
+        ".dylib",
+        ".class",
+        ".pyc",
+        ".o",
+        ".obj",
+        ".bin",
+        ".bak",
+        ".tmp",
+        ".svg",
+        ".eot",
+        ".ttf",
+        ".woff",
+        ".woff2",
+        ".mp4",
+        ".mp3",
+        ".wav",
+        ".mov",
+        ".avi",
+        ".mkv",
+        ".webm",
+        ".jar",
+        ".war",
+        ".ear",
+        ".bmp",
+        ".tif",
+        ".tiff",
+        ".webp",
+        ".psd",
+        ".otf",
+        ".flac",
+        ".ogg",
+        ".m4a",
+        ".aac",
+        ".wmv",
+        ".flv",
+    }
+)
+SKIP_DIRS = frozenset(
+    {
+        "node_modules",
+        "vendor",
+        ".git",
+        ".svn",
+        ".hg",
+        ".idea",
+        ".vscode",
+        "__pycache__",
+        "dist",
+        "build",
+        "target",
+        "bin",
+        "obj",
+    }
+)
 CONNECTORS_AVAILABLE = True
 try:
     import connectors
 except ImportError:
     CONNECTORS_AVAILABLE = False
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+_T = TypeVar("_T")
+
+
+def run_async(main: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run ``main`` to completion on a fresh event loop.
+
+    Uses uvloop when it is installed, which mostly speeds up the socket
+    round trips of the database drivers; otherwise the default asyncio loop.
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 12):
+        return asyncio.run(main, loop_factory=uvloop.new_event_loop)
+    return uvloop.run(main)
+
 
 def _normalize_datetime(dt: datetime) -> datetime:
     """Ensure datetime is offset-aware (UTC)."""
@@ -76,31 +148,17 @@ def _normalize_datetime(dt: datetime) -> datetime:
 
 def is_skippable(file_path: str) -> bool:
     """Check if a file should be skipped based on extension or name."""
-    skip_dirs = {
-        "node_modules",
-        "vendor",
-        ".git",
-        ".svn",
-        ".hg",
-        ".idea",
-        ".vscode",
-        "__pycache__",
-        "dist",
-        "build",
-        "target",
-        "bin",
-        "obj",
-    }
-
-    path = Path(file_path)
-    if path.suffix.lower() in SKIP_EXTENSIONS:
+    # Plain string ops rather than Path(): this runs for every file in a scan.
+    path = str(file_path)
+    if os.altsep:
+        path = path.replace(os.altsep, os.sep)
+    name = path.rstrip(os.sep).rpartition(os.sep)[2]
+    dot = name.rfind(".")
+    # Match Path.suffix: dotfiles like ".env" and names ending in "." have none.
+    if 0 < dot < len(name) - 1 and name[dot:].lower() in SKIP_EXTENSIONS:
         return True
 
-    for part in path.parts:
-        if part in skip_dirs:
-            return True
-
-    return False
+    return not SKIP_DIRS.isdisjoint(path.split(os.sep))
 
 
 def _parse_since(value: Optional[str]) -> Optional[datetime]: